@@ -0,0 +1,284 @@
+"""golf_score.py の各段（解析・読込・判定・整形）を個別に計測するベンチマーク。
+
+挙動:
+    - 合成したスコアカードを 1e3 / 1e5 / 1e6 ケース（--sizes で変更可）生成し、
+      段ごとの処理時間・スループット（ケース/秒）・メモリ確保量のピークを計測する。
+    - 段ごとのメモリは tracemalloc で測った「その段の実行中に増えた確保量のピーク」
+      （peak_alloc_kb）。計測のオーバーヘッドが時間に乗らないよう、時間を測った後に
+      同じ段をもう1回 tracemalloc 付きで実行して測る。入力データなど段の前から
+      確保済みのメモリは含まない。
+    - プロセス全体のピーク RSS（ru_maxrss、単調増加）はサイズごとに1つだけ記録する
+      （process_peak_rss_kb。入力データの生成を含む）。サイズごとに新しいプロセスで
+      計測するため、前のサイズの影響は受けない。
+    - 結果は JSON で保存し、--compare で以前の結果（別コミットなど）と比較できる。
+
+計測する段:
+    - parse_two_lines   : 1ケース分のテキストを解析（ケース数ぶん呼び出し）
+    - parse_case_bytes  : 同じテキストを bytes として解析
+    - read_input        : 一時ディレクトリの tests/*.txt を読込（--read-input-limit 件まで）
+    - judge_outcomes    : Outcome 経路で全ケースを判定
+    - format_outcomes_jp: 判定結果を和名に変換
+    - judge_batch       : NumPy の int8 行列でまとめて判定（pack_cases を含む。NumPy が無ければ省略）
+    - label_case        : (par, stroke) テーブルから直接和名へ（既定の出力経路）
+    - output_lines      : iter_output_lines() で見出し付きの出力行まで（既定のエンジン）
+    - output_lines_batch: iter_output_lines_batch() で同じ出力行まで（--engine batch。NumPy が無ければ省略）
+
+合成データの分布:
+    - 1ラウンドは par3×4 / par4×10 / par5×4 をシャッフルした18ホール。
+    - par との差は現実的な重み（パー・ボギー中心、まれにイーグル以下や 5ボギー以上）で抽選し、
+      一定確率でホールインワン、par5 ではコンドル（1打）も混ぜる。
+
+使用例:
+    $ python bench_golf_score.py
+    $ python bench_golf_score.py --sizes 1000 100000 --out before.json
+    $ python bench_golf_score.py --sizes 1000 100000 --out after.json --compare before.json
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import golf_score as gs
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+READ_INPUT_LIMIT = 10_000
+
+# 1ラウンド分のパー構成（合計72）
+ROUND_PARS = [3] * 4 + [4] * 10 + [5] * 4
+# par との差（stroke - par）とその重み
+DIFF_WEIGHTS = {
+    -3: 1,
+    -2: 8,
+    -1: 120,
+    0: 420,
+    1: 280,
+    2: 100,
+    3: 40,
+    4: 15,
+    5: 8,
+    6: 4,
+    7: 2,
+    8: 1,
+}
+HOLE_IN_ONE_RATE = 0.002
+CONDOR_RATE = 0.001
+
+
+def generate_cases(n: int, seed: int = 0) -> gs.Cases:
+    """合成スコアカードを n ケース生成する。"""
+    rng = random.Random(seed)
+    diffs = list(DIFF_WEIGHTS)
+    weights = list(DIFF_WEIGHTS.values())
+    cases: gs.Cases = []
+    for _ in range(n):
+        pars = ROUND_PARS[:]
+        rng.shuffle(pars)
+        strokes = [
+            max(1, par + d) for par, d in zip(pars, rng.choices(diffs, weights, k=18))
+        ]
+        for i, par in enumerate(pars):
+            r = rng.random()
+            if r < HOLE_IN_ONE_RATE:
+                strokes[i] = 1
+            elif par == 5 and r < HOLE_IN_ONE_RATE + CONDOR_RATE:
+                strokes[i] = 1
+        cases.append([pars, strokes])
+    return cases
+
+
+def case_to_text(case: gs.Case) -> str:
+    """1ケースを ./tests/*.txt と同じ2行テキストにする。"""
+    return "".join(",".join(map(str, row)) + "\n" for row in case)
+
+
+def peak_rss_kb() -> int:
+    """このプロセスのピーク RSS（KiB）を返す。"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS はバイト単位、Linux は KiB 単位で返す
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def peak_alloc_kb(func: Callable[[], object]) -> int:
+    """func を tracemalloc 付きで1回実行し、実行中に増えた確保量のピーク（KiB）を返す。"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak // 1024
+
+
+def time_stage(n: int, func: Callable[[], object]) -> dict:
+    """func を計時して1回、tracemalloc 付きでもう1回実行し、処理時間・スループット・
+    確保量のピークを返す（func は2回呼んでも結果が変わらないこと）。"""
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    return {
+        "cases": n,
+        "seconds": round(seconds, 6),
+        "cases_per_sec": round(n / seconds, 1) if seconds else None,
+        "peak_alloc_kb": peak_alloc_kb(func),
+    }
+
+
+def run_size(n: int, seed: int, read_input_limit: int) -> dict:
+    """1サイズ分の全段を計測する（子プロセスで実行される）。"""
+    cases = generate_cases(n, seed)
+    texts = [case_to_text(c) for c in cases]
+    stages: dict[str, dict] = {}
+
+    stages["parse_two_lines"] = time_stage(
+        n, lambda: [gs.parse_two_lines(io.StringIO(t)) for t in texts]
+    )
+    blobs = [t.encode() for t in texts]
+    stages["parse_case_bytes"] = time_stage(
+        n, lambda: [gs.parse_case_bytes(b) for b in blobs]
+    )
+    del blobs
+
+    n_files = min(n, read_input_limit)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.mkdir(os.path.join(tmp, "tests"))
+        for i, text in enumerate(texts[:n_files]):
+            with open(os.path.join(tmp, "tests", f"case_{i:07d}.txt"), "w") as f:
+                f.write(text)
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            stages["read_input"] = time_stage(n_files, gs.read_input)
+        finally:
+            os.chdir(cwd)
+    del texts
+
+    outcomes: list = []
+
+    def judge_outcomes_all() -> None:
+        outcomes[:] = gs.judge_outcomes(cases)
+
+    stages["judge_outcomes"] = time_stage(n, judge_outcomes_all)
+    stages["format_outcomes_jp"] = time_stage(
+        n, lambda: gs.format_outcomes_jp(outcomes)
+    )
+    del outcomes
+
+    has_numpy = importlib.util.find_spec("numpy") is not None
+
+    def judge_batch_all() -> None:
+        for i in range(0, n, gs.BATCH_SIZE):
+            pars, strokes = gs.pack_cases(cases[i : i + gs.BATCH_SIZE])
+            gs.judge_batch(pars, strokes)
+
+    if has_numpy:
+        stages["judge_batch"] = time_stage(n, judge_batch_all)
+    stages["label_case"] = time_stage(n, lambda: [gs.label_case(c) for c in cases])
+
+    named_cases = [(f"case_{i:07d}.txt", c) for i, c in enumerate(cases)]
+    stages["output_lines"] = time_stage(
+        n, lambda: list(gs.iter_output_lines(named_cases))
+    )
+    if has_numpy:
+        stages["output_lines_batch"] = time_stage(
+            n, lambda: list(gs.iter_output_lines_batch(named_cases))
+        )
+
+    return {"cases": n, "process_peak_rss_kb": peak_rss_kb(), "stages": stages}
+
+
+def git_commit() -> str | None:
+    """現在のコミット ID を返す（git が使えなければ None）。"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: list[dict], baseline: dict | None) -> None:
+    """計測結果を表形式で表示する。baseline があればスループット比も出す。"""
+    base_rates: dict[tuple[int, str], float] = {}
+    if baseline:
+        for r in baseline["results"]:
+            for stage, m in r["stages"].items():
+                base_rates[(r["cases"], stage)] = m["cases_per_sec"]
+
+    print(f"{'cases':>9} {'stage':<20} {'sec':>10} {'cases/s':>12} {'alloc(KiB)':>10}")
+    for r in results:
+        for stage, m in r["stages"].items():
+            line = (
+                f"{r['cases']:>9} {stage:<20} {m['seconds']:>10.4f} "
+                f"{m['cases_per_sec'] or 0:>12.0f} {m['peak_alloc_kb']:>10}"
+            )
+            base = base_rates.get((r["cases"], stage))
+            if base and m["cases_per_sec"]:
+                line += f"  x{m['cases_per_sec'] / base:.2f}"
+            print(line)
+        print(f"{r['cases']:>9} {'(process peak RSS)':<20} {r['process_peak_rss_kb']:>34} KiB")
+
+
+def main() -> None:
+    """エントリーポイント。サイズごとに子プロセスで計測し、JSON に保存する。"""
+    parser = argparse.ArgumentParser(description="golf_score.py の段ごとのベンチマーク")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--read-input-limit",
+        type=int,
+        default=READ_INPUT_LIMIT,
+        help="read_input の計測に使うファイル数の上限",
+    )
+    parser.add_argument("--out", default="bench_golf_score.json")
+    parser.add_argument("--compare", metavar="JSON", help="比較対象の過去の結果")
+    args = parser.parse_args()
+
+    results = []
+    for n in args.sizes:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results.append(
+                executor.submit(run_size, n, args.seed, args.read_input_limit).result()
+            )
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "memory_metric": (
+            "stages.*.peak_alloc_kb: tracemalloc peak of allocations made during "
+            "the stage (separate run); process_peak_rss_kb: ru_maxrss of the "
+            "whole per-size process"
+        ),
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"結果を {args.out} に保存しました。")
+
+
+if __name__ == "__main__":
+    main()
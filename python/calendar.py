@@ -2,173 +2,359 @@
 
 - `python calendar.py`             : 今月を表示し、当日を反転表示する
 - `python calendar.py -m <1..12>`  : 指定月を表示（今月を指定した場合のみ当日を反転表示）
-- 曜日見出しは日本語、表示は6行×7列、日付は2桁右寄せ、タイトルは幅20で中央寄せ。
+- `python calendar.py -y <年>`      : 指定年の12か月を3か月ずつ横に並べて表示（cal -y 風）
+- `python calendar.py -r <開始>..<終了>` : 指定範囲の月（例: 2024-11..2025-02）を3か月ずつ横に並べて表示
+- `python calendar.py -f <書式> ...` : 出力書式を指定（plain / ansi / json / html。既定は ansi）。
+  `-f` は他のオプションの前後どちらに置いてもよい。json / html の複数月表示は1か月ずつ並べる（json は1行1か月）。
+- `python calendar.py --serve [<ソケットのパス>]` : 常駐して1行1リクエストで応答する（下記）。
+
+描画と日付計算は month_calendar.py にあり、このファイルは引数の解析と出力だけを行う。
+ライブラリとして使う場合は month_calendar を import する。
+このファイルは標準ライブラリの calendar と同名のため、このディレクトリを sys.path に入れると
+`import calendar`（http.cookiejar などが内部で行う）がこのファイルを読んでしまう。
+そこで "calendar" として import された場合は、標準ライブラリの calendar に差し替える
+（スクリプトとして実行した場合は差し替えない）。
+
+`--serve` のプロトコル（標準入出力、またはパスを指定した場合は Unix ソケット）:
+    リクエスト: 1行に1件。コマンドラインと同じ `[-f 書式] [-m 月 | -y 年 | -r 範囲]`（空行は今月）か、
+               `[-f 書式] YYYY-MM [日|-]`（指定月。日を付けるとその日を、`-` ならどの日もハイライトしない）。
+    レスポンス: 成功なら "OK <バイト数>\n" に続けて描画結果（UTF-8）、失敗なら "ERR <メッセージ>\n"。
+    「今日」はリクエストごとに datetime.today() で求め直すため、日付をまたいで常駐してもずれない。
+    まとめて届いたリクエストは、その分のレスポンスを1回の書き込みで返す。
+コマンドラインの -y / -r は cal に合わせて 1..9999 年に制限している。
 """
+import asyncio
+import importlib.machinery
+import importlib.util
+import os
+import signal
 import sys
-from datetime import datetime 
 
-
-DAY_OF_WEEK_L = ["月", "火", "水", "木", "金", "土", "日"]
-WEEK_HEADER = " ".join(DAY_OF_WEEK_L)
-class Color:
-    REVERSE = '\033[07m' #文字色と背景色を反転
-    RESET = '\033[0m'    #全てリセット
-
-
-def parse_args() -> tuple[datetime, int | None]:
-    """コマンドライン引数を解析し、(表示対象の月初, ハイライトする日) を返す。
+if __name__ == "calendar":
+    # このディレクトリを除いた sys.path から標準ライブラリの calendar を探して読み込み、
+    # sys.modules を差し替える（import 文は実行後の sys.modules["calendar"] を返す）
+    _here = os.path.dirname(os.path.abspath(__file__))
+    _spec = importlib.machinery.PathFinder.find_spec(
+        __name__, [p for p in sys.path if os.path.abspath(p or os.curdir) != _here]
+    )
+    if _spec is not None and _spec.loader is not None:
+        _stdlib_calendar = importlib.util.module_from_spec(_spec)
+        sys.modules[__name__] = _stdlib_calendar
+        _spec.loader.exec_module(_stdlib_calendar)
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime 
+
+from month_calendar import (
+    DEFAULT_FORMAT,
+    RENDERERS,
+    Weeks,
+    format_month,
+    iter_month_range_chunks,
+    render_month,
+    render_month_range,
+)
+
+
+MIN_YEAR, MAX_YEAR = 1, 9999
+SERVE_READ_SIZE = 64 * 1024   # --serve で1回に読み込む最大バイト数（届いた分のリクエストをまとめて処理する）
+
+
+def parse_args(argv: list[str] | None = None) -> tuple[str, tuple[int, int], tuple[int, int], str]:
+    """コマンドライン引数を解析し、(表示モード, 開始の (年, 月), 終了の (年, 月), 出力書式) を返す。
 
     挙動:
         - 引数なし:
-            今月の1日と、今日の日付（ハイライト）を返す。
+            ("month", 今月, 今月) を返す。
         - `-m <1..12>`:
-            指定月の1日を返す。指定月が「今月」なら今日をハイライト、それ以外は None。
+            ("month", 今年の指定月, 同じ月) を返す。
+        - `-y <年>`:
+            ("year", (年, 1), (年, 12)) を返す。
+        - `-r <YYYY-MM>..<YYYY-MM>`:
+            ("range", 開始月, 終了月) を返す。
         - エラー時:
-            * `-m` 以外のオプションが来たら:  "illegal option -- <文字>" を表示して終了(1)。
+            * `-m` / `-y` / `-r` 以外のオプションが来たら:  "illegal option -- <文字>" を表示して終了(1)。
             * `-m` の値が無い/数値でない/1..12 範囲外/余計な引数あり:
                 "is neither a month number (1..12) nor a name" を表示して終了(1)。
+            * `-y` の値が無い/数値でない/1..9999 範囲外: "year `<値>` not in range 1..9999" を表示して終了(1)。
+            * `-r` の値が無い/形式違い/開始が終了より後: "<値> is not a month range (YYYY-MM..YYYY-MM)" を表示して終了(1)。
+            * `-f` の値が RENDERERS に無い: "unknown format -- <値> (plain, ansi, json, html)" を表示して終了(1)。
+            * `-f` が2回以上ある: "option -f given more than once" を表示して終了(1)。
+        - `-f <書式>` はどの位置にあっても取り除いてから上記を解析する（省略時は DEFAULT_FORMAT）。
+
+    ハイライトする日は表示する月ごとに main 側で決める（今月なら今日、それ以外は無し）。
+
+    Args:
+        argv (list[str] | None): 解析する引数（先頭はスクリプト名）。None なら sys.argv
 
     Returns:
-        tuple[datetime, int | None]: (表示対象の月初, ハイライトする「日」または None)
+        tuple[str, tuple[int, int], tuple[int, int], str]: (表示モード, 開始の (年, 月), 終了の (年, 月), 出力書式)
     """
-    today = datetime.today()
+    argv = sys.argv if argv is None else argv
+    try:
+        return parse_request(argv[1:], datetime.today().date())
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
 
-    if len(sys.argv) >= 2:
-        _ , m_option, *month_arg = sys.argv
+def parse_request(tokens: list[str], today: date) -> tuple[str, tuple[int, int], tuple[int, int], str]:
+    """オプションの並び（スクリプト名を除いた引数）を解析し、parse_args() と同じ4つ組を返す。
 
-        if m_option != "-m":
-            if m_option.startswith("-"):
-                print(f"illegal option -- {m_option.lstrip('-')}")
-            else:
-                print("is neither a month number (1..12) nor a name")
-            sys.exit(1)
+    parse_args() と `--serve` の各リクエストで共用する。表示も終了もしない。
 
-        if len(month_arg) != 1:
-            print("is neither a month number (1..12) nor a name")
-            sys.exit(1)
+    Args:
+        tokens (list[str]): `-f` / `-m` / `-y` / `-r` とその値の並び
+        today (date): 「今年」「今月」の基準にする日
+
+    Returns:
+        tuple[str, tuple[int, int], tuple[int, int], str]: (表示モード, 開始の (年, 月), 終了の (年, 月), 出力書式)
+
+    Raises:
+        ValueError: 不正な引数の場合（メッセージは parse_args() が表示するものと同じ）
+    """
+    this_month = (today.year, today.month)
+
+    fmt, tokens = _split_format(tokens)
+
+    if tokens:
+        option, *values = tokens
+
+        if option == "-y":
+            year = _parse_year(values)
+            return "year", (year, 1), (year, 12), fmt
+
+        if option == "-r":
+            start, end = _parse_range(values)
+            return "range", start, end, fmt
+
+        if option != "-m":
+            if option.startswith("-"):
+                raise ValueError(f"illegal option -- {option.lstrip('-')}")
+            raise ValueError("is neither a month number (1..12) nor a name")
+
+        if len(values) != 1:
+            raise ValueError("is neither a month number (1..12) nor a name")
 
         try:
-            int_month = int(month_arg[0])
+            int_month = int(values[0])
         except ValueError:
-            print(f"{month_arg[0]} is neither a month number (1..12) nor a name")
-            sys.exit(1)
+            raise ValueError(f"{values[0]} is neither a month number (1..12) nor a name") from None
 
         if not (1 <= int_month <= 12):
-            print(f"{int_month} is neither a month number (1..12) nor a name")
-            sys.exit(1)
+            raise ValueError(f"{int_month} is neither a month number (1..12) nor a name")
 
-        beginning_of_month = today.replace(month=int_month, day=1)
-        highlight_day = today.day if today.month == int_month else None
-        return beginning_of_month, highlight_day
+        return "month", (today.year, int_month), (today.year, int_month), fmt
 
     # 引数なしの場合
-    beginning_of_month = today.replace(day=1)
-    highlight_day = today.day
-    return beginning_of_month, highlight_day
+    return "month", this_month, this_month, fmt
 
 
-def is_leap_year(this_year: int) -> bool:
-    """与えられた西暦年が閏年かを判定する。
+def _split_format(tokens: list[str]) -> tuple[str, list[str]]:
+    """`-f` とその値を tokens のどの位置からでも取り出し、(出力書式, 残りのトークン) を返す。
 
-    判定規則:
-        - 400で割り切れる年は閏年
-        - 100で割り切れる年は平年
-        - 4で割り切れる年は閏年
-        - それ以外は平年
+    `-f` が無ければ DEFAULT_FORMAT。値が無い・RENDERERS に無い・`-f` が2回以上ある場合は ValueError。
+    """
+    if "-f" not in tokens:
+        return DEFAULT_FORMAT, tokens
+    i = tokens.index("-f")
+    fmt = tokens[i + 1] if i + 1 < len(tokens) else ""
+    if fmt not in RENDERERS:
+        raise ValueError(f"unknown format -- {fmt} ({', '.join(RENDERERS)})")
+    rest = tokens[:i] + tokens[i + 2:]
+    if "-f" in rest:
+        raise ValueError("option -f given more than once")
+    return fmt, rest
+
+
+def _parse_year(values: list[str]) -> int:
+    """`-y` の値を年（1..9999）として解釈する。不正なら ValueError。"""
+    value = values[0] if len(values) == 1 else ""
+    try:
+        year = int(value)
+    except ValueError:
+        year = None
+    if year is None or not (MIN_YEAR <= year <= MAX_YEAR):
+        raise ValueError(f"year `{value}` not in range {MIN_YEAR}..{MAX_YEAR}")
+    return year
+
+
+def _parse_range(values: list[str]) -> tuple[tuple[int, int], tuple[int, int]]:
+    """`-r` の値 "YYYY-MM..YYYY-MM" を (開始の (年, 月), 終了の (年, 月)) に解釈する。
+
+    不正な形式・範囲外・開始が終了より後の場合は ValueError。
+    """
+    value = values[0] if len(values) == 1 else ""
+    try:
+        start_s, end_s = value.split("..")
+        start = tuple(int(v) for v in start_s.split("-"))
+        end = tuple(int(v) for v in end_s.split("-"))
+        if len(start) != 2 or len(end) != 2:
+            raise ValueError(value)
+    except ValueError:
+        start = end = None
+    if (
+        start is None
+        or end is None
+        or not all(MIN_YEAR <= y <= MAX_YEAR and 1 <= m <= 12 for y, m in (start, end))
+        or start > end
+    ):
+        raise ValueError(f"{value} is not a month range (YYYY-MM..YYYY-MM)".lstrip())
+    return start, end
+
+
+def print_calendar(this_year: int, this_month_jp: str, weeks_l: Weeks) -> None:
+    """format_month() の結果を標準出力に描画する。"""
+    sys.stdout.write(format_month(this_year, this_month_jp, weeks_l))
+
+
+def render_request(tokens: list[str], today: date) -> str:
+    """`--serve` の1リクエスト（空白で区切ったトークン）を描画した文字列を返す。
 
     Args:
-        this_year (int): 判定する年
+        tokens (list[str]): リクエスト行を空白で区切ったもの
+        today (date): ハイライトと「今年」「今月」の基準にする日
 
     Returns:
-        bool: 閏年なら True、平年なら False
+        str: 描画結果（コマンドラインで同じ指定をしたときの出力と同じ）
+
+    Raises:
+        ValueError: 不正なリクエストの場合
     """
-    if this_year % 4 == 0:
-        if this_year % 100 == 0:
-            if this_year % 400 == 0:
-                return True
-            else:
-                return False
+    fmt, rest = _split_format(tokens)
+    if rest and not rest[0].startswith("-"):
+        try:
+            (year, month), _ = _parse_range([f"{rest[0]}..{rest[0]}"])
+        except ValueError:
+            raise ValueError(f"{rest[0]} is not a month (YYYY-MM)") from None
+        if len(rest) == 1:
+            highlight = today.day if (year, month) == (today.year, today.month) else None
+        elif len(rest) == 2 and rest[1] == "-":
+            highlight = None
+        elif len(rest) == 2 and rest[1].isdigit():
+            highlight = int(rest[1])
         else:
-            return True
-    else:
-        return False
-
-
-def generate_monthly_weeks(first_weekday: int, end_of_month: int,  highlight_day: int | None) -> list[list[str]]:
-    """月初の曜日と月末日をもとに、cal風（最大6行×7列）の週配列を生成する。
-
-    仕様:
-        - 出力は「週」を単位とした二次元リスト（各行が1週間、各要素が日付文字列）。
-        - 日付は2桁右寄せ。先頭の空きは "  "（半角スペース2つ）で埋める。
-        - `highlight_day` が指定されている場合、その「日」に
-          反転表示（Color.REVERSE ... Color.RESET）を付与する。
-        - 行数は最大6行（6×7=42セル）に整形する。
-
-    Args:
-        first_weekday (int): 月初の曜日（0=月, 1=火, …, 6=日）※ datetime.weekday() 準拠
-        end_of_month (int): その月の最終日（28, 29, 30, 31 のいずれか）
-        highlight_day (int | None): 反転表示する「日」。ハイライトしない場合は None
+            raise ValueError(f"{' '.join(rest[1:])} is not a day of month")
+        return render_month(year, month, highlight, fmt)
 
-    Returns:
-        list[list[str]]: 週ごとの文字列リストを並べた二次元リスト（最大6行×7列）
-    """
-    def fmt(v: int) -> str:
-        cell = f"{v:>2}"
-        return f"{Color.REVERSE}{cell}{Color.RESET}" if highlight_day is not None and v == highlight_day else cell
+    mode, start, end, fmt = parse_request(tokens, today)
+    if mode == "month":
+        year, month = start
+        highlight = today.day if start == (today.year, today.month) else None
+        return render_month(year, month, highlight, fmt)
+    return render_month_range(start, end, today, year_view=(mode == "year"), fmt=fmt)
 
-    # 先頭の空きを first_weekday個だけ "  " で埋めて、1日〜月末を後ろに並べる
-    days = ["  "]*first_weekday + [fmt(v) for v in range(1, end_of_month + 1)]
-    # 6行×7列で固定（cal準拠）。7日ごとにスライスして週を作る。
-    # 1行の横幅は (2桁の数字 + 区切りスペース1)×7 - 1 = 20 文字
-    return [days[i:i+7] for i in range(0, 42, 7)]
 
+def respond(line: bytes) -> bytes:
+    """リクエスト1行に対するレスポンス（"OK <バイト数>\\n" + 本文、または "ERR <メッセージ>\\n"）を返す。"""
+    try:
+        body = render_request(line.decode("utf-8").split(), datetime.today().date()).encode("utf-8")
+    except (ValueError, UnicodeDecodeError) as e:
+        return f"ERR {e}\n".encode("utf-8")
+    return b"OK %d\n%b" % (len(body), body)
 
-def print_calendar(this_year: int, this_month_jp: str, weeks_l: list[list[str]]) -> None:
-    """タイトル・曜日見出し・週配列を標準出力に描画する（cal風）。
 
-    レイアウト:
-        - タイトルは幅20で中央寄せ（例: "      1月 2025      "）
-        - 見出しはグローバル定数 WEEK_HEADER を使用
-        - 各週（list[str]）はスペース区切りで結合して1行出力
+async def serve_stream(reader: asyncio.StreamReader, write: Callable[[bytes], Awaitable[None]]) -> None:
+    """reader から届いたリクエスト行を処理し、レスポンスを write で返す（EOF まで）。
 
-    Args:
-        this_year (int): 表示する西暦年
-        this_month_jp (str): 表示する月の日本語表記（例: "2月"）
-        weeks_l (list[list[str]]): generate_monthly_weeks の出力（週ごとの二次元リスト）
+    1回の read で届いた完全な行はまとめて処理し、そのレスポンスを1回の write で返す。
+    最後の行が改行で終わっていなければ、次の read まで持ち越す（EOF なら1行として処理する）。
     """
-    title = f"{this_month_jp} {this_year}".center(20)
-    print(title)
-    print(WEEK_HEADER)
-    for w in weeks_l:
-        print(" ".join(w))
+    pending = b""
+    while True:
+        chunk = await reader.read(SERVE_READ_SIZE)
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop() if chunk else b""
+        responses = [respond(line) for line in lines if chunk or line]
+        if responses:
+            await write(b"".join(responses))
+        if not chunk:
+            return
+
+
+async def serve_stdio() -> None:
+    """標準入力からリクエストを読み、標準出力にレスポンスを書く。"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except ValueError:
+        # 通常ファイルをリダイレクトした場合はパイプとして扱えないため、まとめて読み込む
+        reader.feed_data(sys.stdin.buffer.read())
+        reader.feed_eof()
+
+    async def write(data: bytes) -> None:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    await serve_stream(reader, write)
+
+
+async def serve_unix(path: str) -> None:
+    """Unix ソケット path で接続を待ち受け、接続ごとに serve_stream() で応答する（終了まで）。"""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def write(data: bytes) -> None:
+            writer.write(data)
+            await writer.drain()
+
+        try:
+            await serve_stream(reader, write)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(handle, path)
+    # SIGTERM でも KeyboardInterrupt と同じくソケットファイルを消してから終了する
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        os.unlink(path)
+
+
+def serve(path: str | None = None) -> None:
+    """`--serve` のエントリーポイント。path があれば Unix ソケット、無ければ標準入出力で応答する。"""
+    try:
+        asyncio.run(serve_unix(path) if path else serve_stdio())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
 
 
 def main() -> None:
-    """エントリーポイント。
+    """エントリーポイント（render_* を呼んで標準出力に書くだけの薄いラッパー）。
 
     フロー:
-        1) 引数解析で「表示対象の月初」と「ハイライト日」を取得
-        2) 閏年判定を含む月末日の算出
-        3) 週配列（6行×7列）の生成
-        4) カレンダーの描画（タイトル・見出し・各週）
+        1) 引数解析で「表示モード」と「表示する月の範囲」と「出力書式」を取得
+        2) 表示する月を文字列に描画（今月なら今日をハイライト）
+            - 1か月: render_month()（タイトル・見出し・各週を縦に並べる）
+            - 複数月: render_month_range()（3か月ずつ横に並べる。-y は先頭に年の見出し、
+              各月のタイトルは月のみ）
+        3) 描画結果を標準出力へ書き出す
+            - 1か月: 1回の write
+            - 複数月: 3か月の段ごとに1回の write + flush（パイプ先でも段ごとに届く）
+
+    `--serve` の場合は serve() に任せる（モジュール先頭のプロトコルを参照）。
 
     スクリプトとして直接実行されたときのみ実行される想定。
     """
 
-    beginning_of_month, highlight_day = parse_args()
-    first_weekday, this_year, this_month = beginning_of_month.weekday(), beginning_of_month.year, beginning_of_month.month 
-    this_month_jp = f"{this_month}月"
+    if sys.argv[1:2] == ["--serve"]:
+        serve(sys.argv[2] if len(sys.argv) >= 3 else None)
+        return
 
-    # 月末算出（閏年か考慮）
-    if this_month == 2:
-        end_of_month = 29 if is_leap_year(this_year) else 28
-    elif this_month in (4, 6, 9, 11):
-        end_of_month = 30
-    else:
-        end_of_month = 31
+    mode, start, end, fmt = parse_args()
+    today = datetime.today().date()
 
-    weeks_l = generate_monthly_weeks(first_weekday, end_of_month, highlight_day)
-    print_calendar(this_year, this_month_jp,  weeks_l)
+    if mode == "month":
+        year, month = start
+        highlight_day = today.day if start == (today.year, today.month) else None
+        sys.stdout.write(render_month(year, month, highlight_day, fmt))
+    else:
+        for chunk in iter_month_range_chunks(start, end, today, year_view=(mode == "year"), fmt=fmt):
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+"""ゴルフスコアのバイナリアーカイブ（golf_score.py 用）。
+
+./tests/*.txt のようなテキスト形式のスコアカードを、固定長レコードの
+バイナリファイルにまとめて保存し、mmap 経由でコピーなしに読み出す。
+
+ファイル形式（リトルエンディアン）:
+    - ヘッダ（HEADER: 24バイト）
+        magic(4s) = b"GSA1", version(B), holes(B), reserved(H),
+        case_count(Q), ids_offset(Q)
+    - ケース本体: case_count 件 × (holes 個の pars + holes 個の strokes)、各 int8
+    - ID テーブル（ids_offset から）:
+        (case_count + 1) 個の uint64 オフセット + UTF-8 の ID 文字列を連結したもの
+        i 件目の ID は blob[offsets[i]:offsets[i + 1]]
+
+使用例:
+    $ python golf_score.py --pack scores.gsa      # ./tests/*.txt → scores.gsa
+    $ python golf_score.py --archive scores.gsa   # アーカイブを判定
+"""
+
+import contextlib
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+
+MAGIC = b"GSA1"
+VERSION = 1
+HOLES = 18
+HEADER = struct.Struct("<4sBBHQQ")
+
+# アーカイブから読んだ1ケース（pars / strokes の int8 ビュー）
+ArchiveCase = list[memoryview]
+
+
+def write_archive(
+    path: str, named_cases: Iterable[tuple[str, Sequence[Sequence[int]]]], holes: int = HOLES
+) -> int:
+    """(ID, Case) の並びをアーカイブファイルに書き出す。
+
+    ケース本体は1件ずつ書き出すため、保持するのは ID 文字列の一覧のみ。
+    一時ファイルに書いてから置き換えるため、途中でエラーになっても path に
+    書きかけのファイルは残らない（既存のファイルもそのまま）。
+
+    Args:
+        path: 書き出し先のパス。
+        named_cases: (ID, [pars, strokes]) の並び。
+        holes: 1ケースあたりのホール数（既定 18）。
+
+    Raises:
+        ValueError: ホール数が holes と異なる、または値が -128..127 に収まらない場合。
+
+    Returns:
+        int: 書き出したケース数。
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        count = _write_archive_file(tmp_path, named_cases, holes)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return count
+
+
+def _write_archive_file(
+    path: str,
+    named_cases: Iterable[tuple[str, Sequence[Sequence[int]]]],
+    holes: int,
+) -> int:
+    """write_archive() の本体。path に直接書き出す。"""
+    ids: list[bytes] = []
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, holes, 0, 0, 0))
+        for case_id, case in named_cases:
+            if len(case) != 2 or len(case[0]) != holes or len(case[1]) != holes:
+                raise ValueError(f"{case_id}: {holes}ホール分のデータではありません。")
+            try:
+                record = array("b", case[0])
+                record.extend(case[1])
+            except OverflowError:
+                raise ValueError(
+                    f"{case_id}: -128..127 の範囲外の値があります。"
+                ) from None
+            record.tofile(f)
+            ids.append(case_id.encode())
+
+        ids_offset = f.tell()
+        offsets = array("Q", [0])
+        for encoded in ids:
+            offsets.append(offsets[-1] + len(encoded))
+        offsets.tofile(f)
+        f.write(b"".join(ids))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, holes, 0, len(ids), ids_offset))
+    return len(ids)
+
+
+class ScoreArchive:
+    """mmap したアーカイブを読み出すクラス。
+
+    ケース本体は memoryview（int8）としてそのまま参照するため、
+    読み出し時に int 変換やコピーは発生しない。
+
+    使い方:
+        with ScoreArchive("scores.gsa") as archive:
+            for case_id, (pars, strokes) in archive:
+                ...
+    """
+
+    def __init__(self, path: str) -> None:
+        """アーカイブを開いてヘッダを検証する。
+
+        Raises:
+            ValueError: 空ファイル、マジックナンバーやバージョンが一致しない場合、
+                またはヘッダの件数・オフセットがファイルの長さと合わない（途中で切れている）場合。
+        """
+        with open(path, "rb") as f:
+            self.__mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.__mm) < HEADER.size:
+            self.__mm.close()
+            raise ValueError(f"{path} はスコアアーカイブではありません。")
+        magic, version, holes, _, case_count, ids_offset = HEADER.unpack_from(
+            self.__mm
+        )
+        if magic != MAGIC or version != VERSION:
+            self.__mm.close()
+            raise ValueError(f"{path} はスコアアーカイブではありません。")
+
+        size = len(self.__mm)
+        data_end = HEADER.size + case_count * holes * 2
+        offsets_end = ids_offset + (case_count + 1) * 8
+        if not (data_end <= ids_offset and offsets_end <= size):
+            self.__mm.close()
+            raise ValueError(f"{path} は壊れています（ファイルが途中で切れています）。")
+
+        self.__holes = holes
+        self.__count = case_count
+        self.__record_size = holes * 2
+        self.__view = memoryview(self.__mm)
+        self.__data = self.__view[HEADER.size : data_end].cast("b")
+        self.__id_offsets = self.__view[ids_offset:offsets_end].cast("Q")
+        self.__id_blob = self.__view[offsets_end:]
+        if self.__id_offsets[-1] > len(self.__id_blob):
+            self.close()
+            raise ValueError(f"{path} は壊れています（ファイルが途中で切れています）。")
+
+    def __enter__(self) -> "ScoreArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__count
+
+    @property
+    def holes(self) -> int:
+        return self.__holes
+
+    def case_id(self, i: int) -> str:
+        """i 件目のケース ID を返す。"""
+        start, end = self.__id_offsets[i], self.__id_offsets[i + 1]
+        return str(self.__id_blob[start:end], "utf-8")
+
+    def case(self, i: int) -> ArchiveCase:
+        """i 件目のケースを [pars, strokes] の int8 ビューで返す。"""
+        start = i * self.__record_size
+        middle = start + self.__holes
+        return [self.__data[start:middle], self.__data[middle : middle + self.__holes]]
+
+    def __iter__(self) -> Iterator[tuple[str, ArchiveCase]]:
+        """(ID, [pars, strokes]) を先頭から順に返す。
+
+        Note:
+            返したビューは mmap を直接参照するため、close() より後まで保持しないこと。
+        """
+        for i in range(self.__count):
+            yield self.case_id(i), self.case(i)
+
+    def close(self) -> None:
+        """ビューを解放して mmap を閉じる。
+
+        case() が返したビューがまだ残っている場合（例外のトレースバックが参照している
+        ときなど）は mmap を閉じられないため、閉じるのはそれらが解放されたときの GC に任せる。
+        """
+        for view in (self.__data, self.__id_offsets, self.__id_blob, self.__view):
+            view.release()
+        try:
+            self.__mm.close()
+        except BufferError:
+            pass
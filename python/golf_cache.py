@@ -0,0 +1,101 @@
+"""ゴルフスコア判定結果のディスクキャッシュ（golf_score.py --cache 用）。
+
+前回から変わっていないファイルは、読込・解析・判定をせずに前回の出力行を返す。
+
+判定方法:
+    1) パスごとに保存した (mtime_ns, size) が os.stat() と一致すればヒット
+    2) 不一致なら内容を読み、保存済みの SHA-256 と一致すればヒット
+       （touch されただけのファイルなど。stat 情報は更新する）
+    3) どちらも外れたら判定し直して保存する
+
+キャッシュファイル（JSON）:
+    {"version": CACHE_VERSION,
+     "entries": {<パス>: {"mtime_ns": int, "size": int, "sha256": str, "line": str}}}
+
+今回の実行で参照されなかったパス（削除されたファイル）の項目は save() 時に捨てる。
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Callable
+
+CACHE_VERSION = 1
+
+
+class ResultCache:
+    """パス → 出力行 のキャッシュ。"""
+
+    def __init__(self, path: str) -> None:
+        """キャッシュファイルを読み込む。存在しない・壊れている・版が違う場合は空で始める。
+
+        Args:
+            path: キャッシュファイルのパス。
+        """
+        self.__path = path
+        self.__entries: dict[str, dict] = {}
+        self.__seen: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            self.__entries = data.get("entries", {})
+
+    def get_line(self, file_path: str, compute: Callable[[bytes], str]) -> str:
+        """file_path の出力行をキャッシュから返す。無効なら compute(内容) で作り直す。
+
+        Args:
+            file_path: 判定対象のファイルパス。
+            compute: ファイル内容（bytes）から出力行を作る関数。
+
+        Raises:
+            ValueError: compute が送出した場合（入力データの問題）。
+        """
+        self.__seen.add(file_path)
+        st = os.stat(file_path)
+        entry = self.__entries.get(file_path)
+
+        if (
+            entry is not None
+            and entry["mtime_ns"] == st.st_mtime_ns
+            and entry["size"] == st.st_size
+        ):
+            self.hits += 1
+            return entry["line"]
+
+        with open(file_path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if entry is not None and entry["sha256"] == digest:
+            line = entry["line"]
+            self.hits += 1
+        else:
+            line = compute(data)
+            self.misses += 1
+
+        self.__entries[file_path] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": digest,
+            "line": line,
+        }
+        return line
+
+    def save(self) -> None:
+        """今回参照したパスの項目だけを残して、キャッシュファイルを書き出す。
+
+        一時ファイルに書いてから置き換えるため、途中で落ちても元のキャッシュは壊れない。
+        """
+        entries = {p: e for p, e in self.__entries.items() if p in self.__seen}
+        tmp_path = f"{self.__path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": CACHE_VERSION, "entries": entries}, f, ensure_ascii=False
+            )
+        os.replace(tmp_path, self.__path)
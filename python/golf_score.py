@@ -4,13 +4,19 @@
     - 標準入力がある場合は 1 ケースのみを判定し、[stdin] 見出しで出力。
     - 標準入力が無い場合は ./tests/*.txt を **ファイル名の昇順** で処理し、
       各ファイル（1 ケース）ごとに [<ファイル名>] 見出しで出力。
+    - 処理は「読込 → 解析 → 判定 → 整形 → 出力」をケース単位で流すジェネレータ
+      パイプラインで行うため、ファイル数が増えても保持するケースは常に1件のみ。
 
 入力前提:
     - 各ケースは2行（pars, strokes）。
     - 各行は18要素の整数をカンマ区切りで並べる（例: "4,4,5,..."）。
-    - 本スクリプトでは妥当性チェックは最小限（int変換失敗で終了）。
+    - 本スクリプトでは妥当性チェックは最小限（int変換の失敗と、2行でない・
+      2行の要素数が違うケースは入力エラーとして終了）。
 
 判定仕様:
+    - ラベルは (par, stroke) → 和名 の事前計算テーブル（LABEL_TABLE）を引いて求める。
+      テーブル外の組み合わせ（par 3..6 / stroke 0..TABLE_STROKE_LIMIT-1 以外）は
+      以下の規則でその都度判定する。
     - diff = stroke - par
     - par=5 のとき、stroke=1→CONDOR(-4)、stroke=2→ALBATROSS(-3)（特例）
     - それ以外で stroke=1 は「ホールインワン」
@@ -29,20 +35,50 @@
 
     $ cat tests/case_1.txt | python golf_score.py
     [stdin] パー,バーディ,パー,...
+
+    $ python golf_score.py --engine batch   # NumPy の行列でまとめて判定する（NumPy が必要）
+    $ python golf_score.py --workers 8      # ./tests/*.txt を8プロセスで並列判定
+    $ python golf_score.py --pack scores.gsa     # ./tests/*.txt をバイナリアーカイブへ変換
+    $ python golf_score.py --archive scores.gsa  # アーカイブ（golf_archive.py）を判定
+    $ python golf_score.py --stats               # ケース別・ホール別・パー別の集計表
+    $ python golf_score.py --cache .golf_cache.json  # 変更の無いファイルは判定を省略
+
+    $ cat many_cases.txt | python golf_score.py --stream   # 標準入力から複数ケース
+    [round_a] パー,バーディ,パー,...
+    [stdin:2] ボギー,パー,イーグル,...
+
+--stream の入力形式:
+    - pars 行と strokes 行の組を何ケースでも続けて並べる（空行は読み飛ばす）。
+    - pars 行の先頭に "<ケースID>:" を付けるとそれを見出しに使う。
+      省略時は "stdin:<通し番号>"（1始まり）。
+    - 1ケース読み終えるごとに判定して1行出力し、すぐに flush する。
 """
 
+import argparse
+import contextlib
 import os
 import glob
+import multiprocessing
 import sys
-from typing import TextIO, TypeAlias, Literal
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from functools import cache
+from typing import TYPE_CHECKING, BinaryIO, NoReturn, TextIO, TypeAlias, Literal
 from enum import Enum
 from pathlib import Path
 
+import golf_archive
+import golf_cache
+
+if TYPE_CHECKING:
+    import numpy as np
+
 
 # --- type aliases ---
 Row: TypeAlias = list[int]  # 18個想定
 Case: TypeAlias = list[Row]  # 2行想定（pars, strokes）
 Cases: TypeAlias = list[Case]  # 複数ケース
+NamedCase: TypeAlias = tuple[str, Case]  # (見出し, Case)。見出しはファイル名やケースID
 
 
 class Score(Enum):
@@ -73,6 +109,39 @@ OutcomeHoleInOne: TypeAlias = tuple[Literal["hole_in_one"]]
 # ④ 上の3つの“どれか”である、という和（Union）
 Outcome: TypeAlias = OutcomeEnum | OutcomeMultiBogey | OutcomeHoleInOne
 
+# --- バッチ判定用のラベルコード（int16）---
+# -4..1 は Score の値、2 以上は nボギーの n、HOLE_IN_ONE_CODE はホールインワン。
+# 特例を除けばコード = diff になるため、差分行列をそのままラベルの添字に使える。
+# pars / strokes は int8 で詰めるので diff は -255..255 に収まり、HOLE_IN_ONE_CODE とは重ならない。
+HOLE_IN_ONE_CODE = 256
+CODE_OFFSET = 255  # CODE_LABELS の添字 = コード + CODE_OFFSET
+BATCH_SIZE = 4096  # バッチエンジンが一度に行列へ詰めるケース数
+WORKER_CHUNKSIZE = 64  # --workers 時に1プロセスへまとめて渡すファイル数
+FLUSH_EVERY = 1024  # 出力を何行ごとにまとめて書き出すか（--stream 時の既定は 1）
+
+# 同時に指定できないオプションの組（parse_args() でエラーにする）
+# --workers / --cache は ./tests/*.txt を読むときだけの出力方法で、--stats / --engine batch と
+# 同じく出力方法を選ぶオプションのため、どの2つも組み合わせられない。
+OPTION_CONFLICTS = (
+    ("--workers", "--cache"),
+    ("--workers", "--stats"),
+    ("--workers", "--engine batch"),
+    ("--workers", "--stream"),
+    ("--workers", "--archive"),
+    ("--workers", "--pack"),
+    ("--cache", "--stats"),
+    ("--cache", "--engine batch"),
+    ("--cache", "--stream"),
+    ("--cache", "--archive"),
+    ("--cache", "--pack"),
+    ("--stats", "--engine batch"),
+    ("--stats", "--pack"),
+    ("--engine batch", "--stream"),
+    ("--engine batch", "--pack"),
+    ("--stream", "--archive"),
+    ("--stream", "--pack"),
+)
+
 
 def parse_two_lines(stream: TextIO) -> Case:
     """標準入力から2行（pars, strokes）を読み取り、intに変換した Case を1件だけ返す。
@@ -83,24 +152,167 @@ def parse_two_lines(stream: TextIO) -> Case:
         - 返り値は単一の Case。
 
     エラー時:
-        - int変換に失敗した場合はメッセージを表示して終了コード 1 で終了。
+        - 次の場合はメッセージを表示して終了コード 1 で終了（parse_case() の ValueError）。
+            * int変換に失敗した場合
+            * 行数が2（pars 行と strokes 行）でない場合
+            * pars 行と strokes 行の要素数が違う場合
 
     Returns:
         Case: 標準入力から読み込んだ 1ケース（[pars, strokes]）。
     """
-    lines = stream.readlines()
-    case_rows_strs = [line.rstrip("\n").split(",") for line in lines]
-
+    buffer = getattr(stream, "buffer", None)
+    data = buffer.read() if buffer is not None else stream.read().encode()
     try:
-        case: Case = [[int(s) for s in line] for line in case_rows_strs]
+        case = parse_case(data)
     except ValueError as e:
-        print("入力データに問題があります。")
-        print(f"詳細: {e}")
-        sys.exit(1)
+        exit_with_input_error(e)
 
     return case
 
 
+def parse_case_bytes(data: bytes) -> tuple[Case, list[int]]:
+    """ファイル全体のバイト列を1ケースとして一括で int に変換する。
+
+    行ごとに decode / rstrip / str.split を繰り返さず、bytes のまま
+    splitlines → split(b",") → map(int, ...) で1行ずつまとめて変換する。
+    （int() は bytes を直接受け付ける）
+
+    Args:
+        data: pars 行と strokes 行を含むバイト列。
+
+    Raises:
+        ValueError: int変換に失敗した場合。メッセージは parse_case_lines() と同じ
+            （問題のトークンを str として表示する）。
+
+    Returns:
+        tuple[Case, list[int]]:
+            - Case:      [pars, strokes] の1ケース
+            - list[int]: 各行の要素数（18ホールかどうかの確認用）
+    """
+    try:
+        case: Case = [list(map(int, line.split(b","))) for line in data.splitlines()]
+    except ValueError:
+        # bytes のままだとメッセージが b'...' 表記になるため、文字列経路で再変換して
+        # 従来どおりの ValueError を送出させる（全角数字など str なら通る値もここで救う）
+        case = parse_case_lines(data.decode().splitlines())
+    return case, [len(row) for row in case]
+
+
+def parse_case(data: bytes) -> Case:
+    """parse_case_bytes() で1ケースに変換し、その要素数で形を確かめる。
+
+    parse_case_bytes() が返す各行の要素数だけを見るため、確認のために行を走査し直さない。
+
+    Raises:
+        ValueError: int変換に失敗した場合、行数が2でない場合、
+            または pars 行と strokes 行の要素数が違う場合。
+    """
+    case, counts = parse_case_bytes(data)
+    if len(counts) != 2:
+        raise ValueError(f"pars 行と strokes 行の2行が必要です（{len(counts)}行）。")
+    if counts[0] != counts[1]:
+        raise ValueError(
+            f"pars 行と strokes 行の要素数が違います（{counts[0]}個 / {counts[1]}個）。"
+        )
+    return case
+
+
+def read_case_file(file_path: str) -> Case:
+    """1ファイルをバイト列として読み込み、parse_case() で1ケースに変換する。
+
+    Raises:
+        ValueError: int変換に失敗した場合、またはケースの形が不正な場合。
+    """
+    with open(file_path, "rb") as f:
+        return parse_case(f.read())
+
+
+def parse_case_lines(lines: Iterable[str]) -> Case:
+    """行の並び（pars 行, strokes 行）を1ケースとして int に変換する。
+
+    Args:
+        lines: ファイルオブジェクトや文字列リストなど、1行ずつ取り出せるもの。
+
+    Raises:
+        ValueError: int変換に失敗した場合（呼び出し側でメッセージを出して終了する）。
+
+    Returns:
+        Case: [pars, strokes] の1ケース。
+    """
+    return [[int(s) for s in line.rstrip("\n").split(",")] for line in lines]
+
+
+def exit_with_input_error(e: ValueError) -> NoReturn:
+    """入力エラーのメッセージを表示して終了コード 1 で終了する。"""
+    print("入力データに問題があります。")
+    print(f"詳細: {e}")
+    sys.exit(1)
+
+
+def exit_with_file_error(e: OSError) -> NoReturn:
+    """ファイルを開けない・書き込めない場合のメッセージを表示して終了コード 1 で終了する。"""
+    print(f"ファイルを開けません: {e.filename}")
+    print(f"詳細: {e.strerror or e}")
+    sys.exit(1)
+
+
+def iter_case_files(dir_path: str = "./tests/") -> Iterator[str]:
+    """dir_path 配下の *.txt をファイル名の昇順で1件ずつ返す。
+
+    Note:
+        並べ替えのためにパス文字列の一覧だけは保持するが、ファイル内容は読まない。
+    """
+    yield from sorted(glob.glob(os.path.join(dir_path, "*.txt")))
+
+
+def iter_cases(file_paths: Iterable[str]) -> Iterator[NamedCase]:
+    """ファイルを1件ずつ開いて解析し、(ファイル名, Case) を順に返す。
+
+    見出しに使うため、パスのディレクトリ部分は取り除く。
+
+    Raises:
+        ValueError: int変換に失敗した場合、またはケースの形が不正な場合（parse_case()）。
+            main() でメッセージを表示して終了コード 1 で終了する
+            （それまでのケースは出力済みになる点が read_input() と異なる）。
+    """
+    for file_path in file_paths:
+        yield Path(file_path).name, read_case_file(file_path)
+
+
+def iter_stream_cases(stream: BinaryIO) -> Iterator[NamedCase]:
+    """pars 行 / strokes 行の組が続くストリームから、1ケースずつ (ID, Case) を返す。
+
+    挙動:
+        - 空行は読み飛ばし、空でない行を2行ずつ1ケースとして扱う。
+        - pars 行が "<ケースID>:" で始まる場合はそれを ID に使い、
+          無ければ "stdin:<通し番号>" を ID にする。
+        - 2行そろった時点で返すため、パイプの先に常駐させても1ケースずつ処理できる。
+
+    Raises:
+        ValueError: int変換に失敗した場合、pars 行と strokes 行の要素数が違う場合、
+            または strokes 行が欠けたまま終端に達した場合。
+            main() でメッセージを表示して終了コード 1 で終了する。
+    """
+    case_no = 0
+    pars_line: bytes | None = None
+    for line in stream:
+        if not line.strip():
+            continue
+        if pars_line is None:
+            pars_line = line
+            continue
+
+        case_no += 1
+        case_id, sep, pars_body = pars_line.rpartition(b":")
+        name = case_id.strip().decode() if sep else f"stdin:{case_no}"
+        case = parse_case(pars_body + line)
+        pars_line = None
+        yield name, case
+
+    if pars_line is not None:
+        raise ValueError("strokes 行がありません。")
+
+
 def read_input() -> tuple[list[str], Cases]:
     """./tests/*.txt をファイル名の昇順リストで取得し、
         各ファイルを1ケース（pars 行 + strokes行）として読み込んで返す。
@@ -111,29 +323,55 @@ def read_input() -> tuple[list[str], Cases]:
         - 変換済みの Case を Cases に蓄積。
 
     エラー時:
-        - int変換に失敗した場合はメッセージを表示して終了コード 1 で終了。
+        - いずれかのファイルで次の場合はメッセージを表示して終了コード 1 で終了
+          （parse_case() の ValueError）。
+            * int変換に失敗した場合
+            * 行数が2（pars 行と strokes 行）でない場合
+            * pars 行と strokes 行の要素数が違う場合
 
     Returns:
         tuple[list[str], Cases]:
             - list[str]: 読み込んだファイルパスのリスト（昇順）
             - Cases:     各ファイルから得た Case を並べたリスト
     """
-    dir_path = "./tests/"
-    file_list = sorted(glob.glob(os.path.join(dir_path, "*.txt")))
-    case_rows_strs = [[] for _ in range(len(file_list))]
+    file_list = list(iter_case_files())
+    case_rows_bytes = [b""] * len(file_list)
     for i, file_path in enumerate(file_list):
-        with open(file_path, "r") as f:
-            lines = f.readlines()
-            case_rows_strs[i] = [line.rstrip("\n").split(",") for line in lines]
+        with open(file_path, "rb") as f:
+            case_rows_bytes[i] = f.read()
     try:
-        cases = [[[int(s) for s in line2] for line2 in line] for line in case_rows_strs]
+        cases = [parse_case(data) for data in case_rows_bytes]
     except ValueError as e:
-        print("入力データに問題があります。")
-        print(f"詳細: {e}")
-        sys.exit(1)
+        exit_with_input_error(e)
     return file_list, cases
 
 
+def judge_one(par: int, stroke: int) -> Outcome:
+    """1ホール分の (par, stroke) を Outcome（タグ付きタプル）に判定する。"""
+    diff = stroke - par
+
+    # Par5の1打/2打はコンドル/アルバトロス
+    if par == 5 and (stroke == 1 or stroke == 2):
+        return ("enum", Score(diff))
+
+    # それ以外の1打はホールインワン
+    if stroke == 1:
+        return ("hole_in_one",)
+
+    # +2以上はnボギー
+    if diff >= 2:
+        return ("multi_bogey", diff)
+
+    # それ以外はEnumにマップ
+    return ("enum", Score(diff))
+
+
+def judge_case(case: Case) -> list[Outcome]:
+    """1ケース（18ホール）を判定し、Outcome のリストを返す（OUTCOME_TABLE 経由）。"""
+    pars, strokes = case
+    return [lookup_outcome(par, stroke) for par, stroke in zip(pars, strokes)]
+
+
 def judge_outcomes(cases: Cases) -> list[list[Outcome]]:
     """各ケースの18ホールを判定し、Outcome（タグ付きタプル）の二次元リストを返す。
 
@@ -147,33 +385,7 @@ def judge_outcomes(cases: Cases) -> list[list[Outcome]]:
     Returns:
         list[list[Outcome]]: cases（ケース配列）× 18ホールの Outcome 二次元リスト。
     """
-
-    def judge_one(par: int, stroke: int) -> Outcome:
-        diff = stroke - par
-
-        # Par5の1打/2打はコンドル/アルバトロス
-        if par == 5 and (stroke == 1 or stroke == 2):
-            return ("enum", Score(diff))
-
-        # それ以外の1打はホールインワン
-        if stroke == 1:
-            return ("hole_in_one",)
-
-        # +2以上はnボギー
-        if diff >= 2:
-            return ("multi_bogey", diff)
-
-        # それ以外はEnumにマップ
-        return ("enum", Score(diff))
-
-    outcomes: list[list[Outcome]] = []
-    for one_case in cases:
-        pars, strokes = one_case
-        row_outcomes: list[Outcome] = []
-        for par, stroke in zip(pars, strokes):
-            row_outcomes.append(judge_one(par, stroke))
-        outcomes.append(row_outcomes)
-    return outcomes
+    return [judge_case(one_case) for one_case in cases]
 
 
 def format_outcomes_jp(outcomes: list[list[Outcome]]) -> list[list[str]]:
@@ -187,53 +399,617 @@ def format_outcomes_jp(outcomes: list[list[Outcome]]) -> list[list[str]]:
     Returns:
         list[list[str]]: ケース×18ホールの日本語ラベル二次元リスト。
     """
-    labels: list[list[str]] = []
-    for row in outcomes:
-        row_labels: list[str] = []
-        for outcome in row:
-            match outcome:
-                case ("enum", score):
-                    row_labels.append(
-                        SCORE_LABELS[score]
-                    )  # score は Score と推論される
-                case ("multi_bogey", n):
-                    row_labels.append(f"{n}ボギー")  # n は int
-                case ("hole_in_one",):
-                    row_labels.append("ホールインワン")
-        labels.append(row_labels)
-    return labels
+    return [format_case_jp(row) for row in outcomes]
+
+
+def format_case_jp(row: list[Outcome]) -> list[str]:
+    """1ケース分の Outcome を日本語ラベルのリストに変換する（OUTCOME_LABELS 経由）。"""
+    labels = OUTCOME_LABELS
+    return [labels.get(outcome) or outcome_label(outcome) for outcome in row]
+
+
+def outcome_label(outcome: Outcome) -> str:
+    """Outcome 1件を規則どおりに日本語ラベルへ変換する（テーブル構築・テーブル外用）。"""
+    match outcome:
+        case ("enum", score):
+            return SCORE_LABELS[score]  # score は Score と推論される
+        case ("multi_bogey", n):
+            return f"{n}ボギー"  # n は int
+        case ("hole_in_one",):
+            return "ホールインワン"
+    raise ValueError(f"未知の Outcome です: {outcome!r}")
+
+
+# --- (par, stroke) → Outcome / 和名 の事前計算テーブル ---
+# 添字は (par - TABLE_MIN_PAR) * TABLE_STROKE_LIMIT + stroke。
+# Score に対応しない組み合わせ（par6 の1打未満など）は None を入れ、規則側で判定させる。
+TABLE_MIN_PAR = 3
+TABLE_MAX_PAR = 6
+TABLE_STROKE_LIMIT = 32
+
+
+def _build_tables() -> tuple[tuple[Outcome | None, ...], tuple[str | None, ...]]:
+    """OUTCOME_TABLE と LABEL_TABLE を構築する。ラベル文字列は intern して共有する。"""
+    outcomes: list[Outcome | None] = []
+    labels: list[str | None] = []
+    for par in range(TABLE_MIN_PAR, TABLE_MAX_PAR + 1):
+        for stroke in range(TABLE_STROKE_LIMIT):
+            try:
+                outcome = judge_one(par, stroke)
+            except ValueError:
+                outcomes.append(None)
+                labels.append(None)
+                continue
+            outcomes.append(outcome)
+            labels.append(sys.intern(outcome_label(outcome)))
+    return tuple(outcomes), tuple(labels)
+
+
+OUTCOME_TABLE, LABEL_TABLE = _build_tables()
+OUTCOME_LABELS: dict[Outcome, str] = {
+    outcome: label
+    for outcome, label in zip(OUTCOME_TABLE, LABEL_TABLE)
+    if outcome is not None and label is not None
+}
+
+
+def _table_index(par: int, stroke: int) -> int | None:
+    """テーブルの添字を返す。テーブル外の組み合わせなら None。"""
+    if TABLE_MIN_PAR <= par <= TABLE_MAX_PAR and 0 <= stroke < TABLE_STROKE_LIMIT:
+        return (par - TABLE_MIN_PAR) * TABLE_STROKE_LIMIT + stroke
+    return None
+
+
+def lookup_outcome(par: int, stroke: int) -> Outcome:
+    """(par, stroke) の Outcome をテーブルから引く。テーブル外は judge_one() で判定。"""
+    i = _table_index(par, stroke)
+    if i is not None:
+        outcome = OUTCOME_TABLE[i]
+        if outcome is not None:
+            return outcome
+    return judge_one(par, stroke)
+
+
+def lookup_label(par: int, stroke: int) -> str:
+    """(par, stroke) の和名ラベルをテーブルから引く。テーブル外は規則どおりに判定。"""
+    i = _table_index(par, stroke)
+    if i is not None:
+        label = LABEL_TABLE[i]
+        if label is not None:
+            return label
+    return outcome_label(judge_one(par, stroke))
+
+
+def label_case(case: Case) -> list[str]:
+    """1ケースを Outcome を経由せず、直接和名ラベルのリストに変換する。
+
+    format_case_jp(judge_case(case)) と同じ結果になる。
+    """
+    pars, strokes = case
+    return [lookup_label(par, stroke) for par, stroke in zip(pars, strokes)]
+
+
+def iter_output_lines(named_cases: Iterable[NamedCase]) -> Iterator[str]:
+    """(見出し, Case) を1件ずつ判定・整形し、出力行（見出し付き）を順に返す。
+
+    Returns:
+        Iterator[str]: "[<見出し>] ラベル,ラベル,..." 形式の行。
+    """
+    for name, case in named_cases:
+        yield format_case_line(name, case)
+
+
+def format_case_line(name: str, case: Case) -> str:
+    """1ケースを判定し、"[<見出し>] ラベル,ラベル,..." 形式の1行にする。
+
+    name はそのまま見出しにする（--stream のケースIDに "/" が含まれていても切り詰めない）。
+    ファイルパスから作る場合は、呼び出し側でファイル名だけにしておくこと。
+    """
+    return f"[{name}] {','.join(label_case(case))}"
+
+
+def _import_numpy():
+    """バッチエンジン用に NumPy を import して返す。"""
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError(
+            "--engine batch / judge_batch() には NumPy が必要です（pip install numpy）。"
+        ) from None
+    return np
+
+
+def pack_cases(cases: Sequence[Case]) -> tuple["np.ndarray", "np.ndarray"]:
+    """ホール数の同じケースを (ケース数, ホール数) の int8 行列2つ（pars, strokes）に詰める。
+
+    Raises:
+        ValueError: ケースごとにホール数が違う場合、または pars 行と strokes 行の長さが違う場合。
+        OverflowError: int8（-128..127）に収まらない値を含む場合。
+        ImportError: NumPy がインストールされていない場合。
+    """
+    np = _import_numpy()
+    matrix = np.array(cases, dtype=np.int8)
+    if matrix.ndim != 3 or matrix.shape[1] != 2:
+        raise ValueError("pars 行と strokes 行のホール数がそろっていません。")
+    return matrix[:, 0], matrix[:, 1]
+
+
+def judge_batch(pars: "np.ndarray", strokes: "np.ndarray") -> "np.ndarray":
+    """pars / strokes 行列をまとめて判定し、同じ形のラベルコード行列（int16）を返す。
+
+    judge_one() と同じ判定を、ホールごとの分岐ではなく行列全体への2回の演算で行う。
+        1) diff = strokes - pars（コンドル/アルバトロス/nボギー/Enum はこの時点で確定）
+        2) stroke=1 かつ par5 以外の位置を np.where で HOLE_IN_ONE_CODE に置き換える
+           （par5 の1打/2打は diff がそのまま -4 / -3 になるため特別扱いは要らない）
+
+    Returns:
+        np.ndarray: HOLE_IN_ONE_CODE または diff を並べた int16 行列。
+            Score に対応しないコード（diff が -5 以下）もそのまま入る（CODE_LABELS は None）。
+
+    Raises:
+        ImportError: NumPy がインストールされていない場合。
+    """
+    np = _import_numpy()
+    diff = strokes.astype(np.int16) - pars
+    return np.where((strokes == 1) & (pars != 5), np.int16(HOLE_IN_ONE_CODE), diff)
+
+
+def code_to_outcome(code: int) -> Outcome:
+    """ラベルコードを Outcome（タグ付きタプル）に戻す。
+
+    Raises:
+        ValueError: Score に対応しない diff（-5 以下）の場合。judge_one() と同じ挙動。
+    """
+    if code == HOLE_IN_ONE_CODE:
+        return ("hole_in_one",)
+    if code >= 2:
+        return ("multi_bogey", code)
+    return ("enum", Score(code))
+
+
+def _build_code_labels() -> tuple[str | None, ...]:
+    """ラベルコード（-255..HOLE_IN_ONE_CODE）→ 和名のテーブルを構築する。添字は code + CODE_OFFSET。"""
+    labels: list[str | None] = []
+    for code in range(-CODE_OFFSET, HOLE_IN_ONE_CODE + 1):
+        try:
+            labels.append(sys.intern(outcome_label(code_to_outcome(code))))
+        except ValueError:
+            labels.append(None)  # Score に対応しないコード
+    return tuple(labels)
+
+
+CODE_LABELS = _build_code_labels()
+
+
+@cache
+def _code_label_arrays() -> tuple["np.ndarray", "np.ndarray"]:
+    """CODE_LABELS を NumPy 配列にしたもの（コード行列で一度に引くため）。
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            - 和名の object 配列（CODE_LABELS と同じ並び）
+            - 各コードが Score に対応するか（CODE_LABELS が None でないか）の bool 配列
+    """
+    np = _import_numpy()
+    labels = np.array(CODE_LABELS, dtype=object)
+    return labels, labels != None  # noqa: E711（要素ごとの比較）
+
+
+def iter_output_lines_batch(
+    named_cases: Iterable[NamedCase], batch_size: int = BATCH_SIZE
+) -> Iterator[str]:
+    """iter_output_lines() のバッチエンジン版。出力内容は同一。
+
+    batch_size 件ずつ行列へ詰めて judge_batch() で一括判定するため、
+    保持するのは常に1バッチ分のみ。
+
+    Raises:
+        ValueError: 判定できない値を含むケースがあった場合（iter_output_lines() と同じ）。
+        ImportError: NumPy がインストールされていない場合。
+    """
+    batch: list[NamedCase] = []
+    for named_case in named_cases:
+        batch.append(named_case)
+        if len(batch) >= batch_size:
+            yield from _format_batch(batch)
+            batch = []
+    if batch:
+        yield from _format_batch(batch)
+
+
+def _format_batch(batch: list[NamedCase]) -> Iterator[str]:
+    """1バッチ分のケースを判定し、見出し付きの出力行を入力順に返す。
+
+    ホール数ごとに行列へ詰めて判定し、コード行列で CODE_LABELS を一度に引く。
+    次のケースは行列に載せず、入力順の位置で format_case_line() に回す
+    （判定できない値ならそこで ValueError になり、それより前の行は出力済みになる）。
+        - pars 行と strokes 行の長さが違う、または int8 に収まらない値を含むケース
+        - Score に対応しないコード（CODE_LABELS が None）を含むケース
+    """
+    labels, known = _code_label_arrays()
+    lines: list[str | None] = [None] * len(batch)
+
+    groups: dict[int, list[int]] = {}
+    for i, (_, (pars, strokes)) in enumerate(batch):
+        if len(pars) == len(strokes):
+            groups.setdefault(len(pars), []).append(i)
+
+    for indices in groups.values():
+        try:
+            pars, strokes = pack_cases([batch[i][1] for i in indices])
+        except OverflowError:
+            continue
+        codes = judge_batch(pars, strokes) + CODE_OFFSET
+        rows = labels[codes].tolist()
+        for i, row, ok in zip(indices, rows, known[codes].all(axis=1).tolist()):
+            if ok:
+                lines[i] = f"[{batch[i][0]}] {','.join(row)}"
+
+    for line, (name, case) in zip(lines, batch):
+        yield line if line is not None else format_case_line(name, case)
+
+
+# --- 集計（--stats）---
+# 和名の並び順：コンドル → … → ボギー → 2ボギー → 3ボギー … → ホールインワン
+def outcome_sort_key(outcome: Outcome) -> tuple[int, int]:
+    """集計表で Outcome を並べるためのキーを返す。"""
+    match outcome:
+        case ("enum", score):
+            return (0, score.value)
+        case ("multi_bogey", n):
+            return (1, n)
+        case _:
+            return (2, 0)
+
+
+def format_counts(counts: Counter, total: int | None = None) -> str:
+    """Outcome ごとの件数を "ラベル:件数,..." 形式にする。total 指定時は割合も付ける。"""
+    cells: list[str] = []
+    for outcome in sorted(counts, key=outcome_sort_key):
+        cell = f"{outcome_label(outcome)}:{counts[outcome]}"
+        if total:
+            cell += f"({counts[outcome] / total:.1%})"
+        cells.append(cell)
+    return ",".join(cells)
+
+
+class ScoreStats:
+    """判定結果（Outcome）をケースを跨いで集計するクラス。
+
+    ホール番号別・パー別・全体の3種類の Counter を持つ。キーは Outcome なので
+    保持する要素数は「ホール数 × 出現した Outcome の種類」で頭打ちになり、
+    ケース数が増えてもメモリは増えない。
+    """
+
+    def __init__(self) -> None:
+        self.case_count = 0
+        self.by_hole: list[Counter] = []
+        self.by_par: dict[int, Counter] = {}
+        self.total: Counter = Counter()
+
+    def add(self, case: Case) -> Counter:
+        """1ケースを判定して集計に加え、そのケース単体の Counter を返す。"""
+        pars, _ = case
+        outcomes = judge_case(case)
+        while len(self.by_hole) < len(outcomes):
+            self.by_hole.append(Counter())
+
+        for hole, (par, outcome) in enumerate(zip(pars, outcomes)):
+            self.by_hole[hole][outcome] += 1
+            self.by_par.setdefault(par, Counter())[outcome] += 1
+
+        case_counts = Counter(outcomes)
+        self.total.update(case_counts)
+        self.case_count += 1
+        return case_counts
+
+    def summary_lines(self) -> Iterator[str]:
+        """ホール別・パー別・全体の集計表を1行ずつ返す。"""
+        yield "== ホール別 =="
+        for hole, counts in enumerate(self.by_hole, start=1):
+            yield f"{hole}番: {format_counts(counts)}"
+
+        yield "== パー別 =="
+        for par in sorted(self.by_par):
+            counts = self.by_par[par]
+            holes = counts.total()
+            yield f"par{par}（{holes}ホール）: {format_counts(counts, holes)}"
+
+        holes = self.total.total()
+        yield f"== 全体（{self.case_count}ケース / {holes}ホール） =="
+        yield format_counts(self.total, holes)
+
+
+def iter_stats_lines(named_cases: Iterable[NamedCase]) -> Iterator[str]:
+    """ケースごとの Outcome 件数を1行ずつ返し、最後に集計表を返す。
+
+    Returns:
+        Iterator[str]: "[<見出し>] ラベル:件数,..." の行と、集計表の行。
+    """
+    stats = ScoreStats()
+    for name, case in named_cases:
+        yield f"[{name}] {format_counts(stats.add(case))}"
+    yield from stats.summary_lines()
+
+
+def score_file(file_path: str) -> tuple[str | None, ValueError | None]:
+    """1ファイルを読み込んで判定し、(見出し付きの出力行, None) を返す（ワーカープロセス用）。
+
+    入力データの問題（ValueError）は送出せず (None, 例外) として返す。
+    Pool.imap はワーカーで例外が起きるとそのチャンクの結果をまとめて捨てるため、
+    同じチャンク内でそれより前のファイルの出力行まで失われないようにする。
+    """
+    try:
+        return format_case_line(Path(file_path).name, read_case_file(file_path)), None
+    except ValueError as e:
+        return None, e
+
+
+def iter_output_lines_parallel(
+    file_paths: Iterable[str], workers: int, chunksize: int = WORKER_CHUNKSIZE
+) -> Iterator[str]:
+    """ファイル一覧をプロセスプールに分配して判定し、出力行を入力順に返す。
+
+    Pool.imap は chunksize 件ずつワーカーへ配り、結果を入力順に並べ直しながら
+    届いた順に返すため、全件の完了を待たずにファイル名の昇順で出力できる。
+
+    Raises:
+        ValueError: ワーカーで入力データの問題が見つかった場合。そのファイルより前の行を
+            全て返してから送出する（--workers 1 のときと同じ位置で止まる）。
+    """
+    with multiprocessing.Pool(workers) as pool:
+        for line, error in pool.imap(score_file, file_paths, chunksize):
+            if error is not None:
+                raise error
+            yield line
+
+
+def iter_output_lines_cached(
+    file_paths: Iterable[str], cache: golf_cache.ResultCache
+) -> Iterator[str]:
+    """前回から変わっていないファイルはキャッシュの出力行を返し、それ以外は判定する。
+
+    全件を返し終えたらキャッシュを保存する（削除されたファイルの項目はここで消える）。
+
+    Raises:
+        ValueError: int変換に失敗した場合、またはケースの形が不正な場合（キャッシュは保存しない）。
+    """
+    for file_path in file_paths:
+        yield cache.get_line(
+            file_path,
+            lambda data: format_case_line(Path(file_path).name, parse_case(data)),
+        )
+    cache.save()
+
+
+def write_lines(lines: Iterable[str], out: TextIO, flush_every: int) -> None:
+    """出力行を flush_every 行ずつまとめ、1回の write で書き出す。
+
+    1行ごとの print() と比べて write / flush の回数が 1/flush_every になる。
+    途中で例外が起きても、それまでに溜めた行は書き出してから伝える
+    （エラーメッセージより前の行が欠けたり、順序が入れ替わったりしないように）。
+
+    Args:
+        lines: 改行を含まない出力行。
+        out: 書き出し先（通常は sys.stdout）。
+        flush_every: 何行ごとに書き出して flush するか（1 なら毎行）。
+    """
+    buffer: list[str] = []
+    try:
+        for line in lines:
+            buffer.append(line)
+            if len(buffer) >= flush_every:
+                buffer.append("")  # 末尾の改行
+                out.write("\n".join(buffer))
+                out.flush()
+                buffer.clear()
+    finally:
+        if buffer:
+            buffer.append("")
+            out.write("\n".join(buffer))
+            out.flush()
+
+
+def _positive_int(value: str) -> int:
+    """argparse 用：1以上の整数に変換する。"""
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"1以上の整数を指定してください: {value}")
+    return n
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する。
+
+    オプション:
+        --engine {outcome,batch}: 判定エンジン（既定は Outcome 経路の "outcome"、
+            batch は NumPy が必要）。
+        --workers N: ./tests/*.txt を N プロセスで並列判定する（既定 1 = 並列化なし）。
+        --chunksize N: --workers 時に1プロセスへまとめて渡すファイル数。
+        --stream: 標準入力を複数ケースのストリームとして1ケースずつ判定・出力する。
+        --pack OUT: ./tests/*.txt をバイナリアーカイブ OUT に変換して終了する。
+        --archive PATH: ./tests/*.txt の代わりにアーカイブ PATH を判定する。
+        --stats: ラベルの代わりにケース別の件数と、ホール別・パー別・全体の集計表を出す。
+        --cache PATH: ./tests/*.txt の判定結果を PATH にキャッシュし、変更の無い
+            ファイルは読込・判定を省略する（golf_cache.py）。
+        --flush-every N: 出力を N 行ごとにまとめて書き出す
+            （既定は FLUSH_EVERY 行、--stream 時は 1 行）。
+
+    エラー時:
+        - OPTION_CONFLICTS の組を同時に指定した場合。
+        - 標準入力がパイプ/リダイレクトなのに --workers 2 以上 / --cache を指定した場合、
+          または標準入力が端末なのに --stream を指定した場合（読む入力と合わないため）。
+        いずれも argparse のエラー（使い方と理由を表示して終了コード 2）で終了する。
+    """
+    parser = argparse.ArgumentParser(description="ゴルフスコアを和名で判定する。")
+    parser.add_argument(
+        "--engine",
+        choices=("outcome", "batch"),
+        default="outcome",
+        help="判定エンジン（batch は NumPy の行列でまとめて判定する。NumPy が必要）",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="./tests/*.txt を判定するプロセス数",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=_positive_int,
+        default=WORKER_CHUNKSIZE,
+        help="--workers 時に1プロセスへまとめて渡すファイル数",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="標準入力から pars/strokes 行の組を複数ケース読み、1ケースずつ出力する",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="ケース別・ホール別・パー別・全体の判定結果の件数を集計して出力する",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="./tests/*.txt の判定結果を PATH にキャッシュし、変更の無いファイルを省略する",
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=_positive_int,
+        metavar="N",
+        help=f"出力を N 行ごとにまとめて書き出す（既定 {FLUSH_EVERY}、--stream 時は 1）",
+    )
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument(
+        "--pack",
+        metavar="OUT",
+        help="./tests/*.txt をバイナリアーカイブ OUT に変換して終了する",
+    )
+    archive.add_argument(
+        "--archive",
+        metavar="PATH",
+        help="./tests/*.txt の代わりにバイナリアーカイブ PATH を判定する",
+    )
+    args = parser.parse_args(argv)
+
+    selected = {
+        "--workers": args.workers > 1,
+        "--cache": args.cache is not None,
+        "--stats": args.stats,
+        "--engine batch": args.engine == "batch",
+        "--stream": args.stream,
+        "--archive": args.archive is not None,
+        "--pack": args.pack is not None,
+    }
+    for a, b in OPTION_CONFLICTS:
+        if selected[a] and selected[b]:
+            parser.error(f"{a} と {b} は同時に指定できません。")
+
+    reads_test_files = not args.pack and not args.archive and sys.stdin.isatty()
+    if not reads_test_files and not args.pack and not args.archive:
+        for option in ("--workers", "--cache"):
+            if selected[option]:
+                parser.error(
+                    f"{option} は ./tests/*.txt を読む場合（標準入力が端末のとき）のみ指定できます。"
+                )
+    if args.stream and sys.stdin.isatty():
+        parser.error("--stream は標準入力（パイプ/リダイレクト）から読む場合のみ指定できます。")
+    return args
+
+
+def open_named_cases(
+    args: argparse.Namespace, stack: contextlib.ExitStack
+) -> Iterable[NamedCase]:
+    """引数と標準入力の状態から、(見出し, Case) の入力元を選んで返す。
+
+    入力元:
+        - --archive 指定時     : golf_archive.ScoreArchive（stack で close を管理）
+        - 非端末 + --stream    : iter_stream_cases(sys.stdin.buffer)
+        - 非端末（パイプ/リダイレクト）: parse_two_lines(sys.stdin) の1ケース、見出しは "stdin"
+        - 端末                 : iter_cases() で ./tests/*.txt を1件ずつ
+
+    エラー時:
+        - --archive のファイルが壊れている（ValueError）、または開けない（OSError）場合は
+          メッセージを表示して終了コード 1 で終了。
+    """
+    if args.archive:
+        try:
+            archive = golf_archive.ScoreArchive(args.archive)
+        except ValueError as e:
+            exit_with_input_error(e)
+        except OSError as e:
+            exit_with_file_error(e)
+        return stack.enter_context(archive)
+    if not sys.stdin.isatty():
+        if args.stream:
+            return iter_stream_cases(sys.stdin.buffer)
+        return [("stdin", parse_two_lines(sys.stdin))]
+    return iter_cases(iter_case_files())
 
 
 def main():
     """エントリーポイント。
 
     フロー:
-        1) 標準入力が端末か（isatty）で入力経路を分岐
-            - 非端末（パイプ/リダイレクト）: parse_two_lines(sys.stdin) で1ケース読込、見出しは "stdin"
-            - 端末                 : read_input() で ./tests/*.txt を全件処理
-        2) judge_outcomes() で判定
-        3) format_outcomes_jp() で和名に変換
-        4) 見出し（[stdin] または [<ファイル名>]）＋ カンマ区切りで出力
+        1) --pack 指定時は ./tests/*.txt をアーカイブへ変換して終了
+        2) open_named_cases() で入力元（アーカイブ / 標準入力 / ./tests/*.txt）を選ぶ
+        3) 出力行の生成方法を選ぶ（組み合わせられない指定は parse_args() でエラー済み）
+            - --stats              : iter_stats_lines() で件数と集計表
+            - --workers 2 以上     : iter_output_lines_parallel() でファイルを並列判定
+                                     （./tests/*.txt を読む場合のみ）
+            - --cache 指定時       : iter_output_lines_cached() で変更の無いファイルを省略
+                                     （./tests/*.txt を読む場合のみ）
+            - --engine batch       : iter_output_lines_batch() で NumPy の行列ごとに判定
+            - それ以外             : iter_output_lines() でケースごとに判定
+        4) write_lines() で --flush-every 行ずつまとめて標準出力へ書き出す
+           （全件の読込完了を待たない。--stream 時の既定は毎行）
+        5) 入力データの問題（ValueError）はそこまでの出力を書き出してから
+           メッセージを表示し、終了コード 1 で終了
+        6) --engine batch で NumPy が無い場合（ImportError）はメッセージを標準エラー出力に
+           表示し、終了コード 1 で終了
 
     Returns:
         None: 標準出力へ結果を出す。
     """
-    file_list: list[str] = []
-
-    if not sys.stdin.isatty():
-        one_case = parse_two_lines(sys.stdin)
-        cases = [one_case]
-        file_list = ["stdin"]
-    else:
-        file_list, cases = read_input()
-    outcomes = judge_outcomes(cases)
-    jp_labels = format_outcomes_jp(outcomes)
-
-    for i, label_row in enumerate(jp_labels):
-        joined_scores = ",".join(label_row)
-        path = file_list[i]
-        file_name = Path(path).name
-        print(f"[{file_name}]", joined_scores)
+    args = parse_args()
+
+    if args.pack:
+        try:
+            count = golf_archive.write_archive(args.pack, iter_cases(iter_case_files()))
+        except ValueError as e:
+            exit_with_input_error(e)
+        except OSError as e:
+            exit_with_file_error(e)
+        print(f"{count}件を {args.pack} に書き出しました。")
+        return
+
+    with contextlib.ExitStack() as stack:
+        lines: Iterable[str]
+        if args.stats:
+            lines = iter_stats_lines(open_named_cases(args, stack))
+        elif args.workers > 1:
+            lines = iter_output_lines_parallel(
+                iter_case_files(), args.workers, args.chunksize
+            )
+        elif args.cache:
+            lines = iter_output_lines_cached(
+                iter_case_files(), golf_cache.ResultCache(args.cache)
+            )
+        elif args.engine == "batch":
+            lines = iter_output_lines_batch(open_named_cases(args, stack))
+        else:
+            lines = iter_output_lines(open_named_cases(args, stack))
+
+        flush_every = args.flush_every or (1 if args.stream else FLUSH_EVERY)
+        try:
+            write_lines(lines, sys.stdout, flush_every)
+        except ValueError as e:
+            exit_with_input_error(e)
+        except ImportError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
 
 
 if __name__ == "__main__":
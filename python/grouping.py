@@ -1,24 +1,412 @@
+"""メンバーをランダムにグループ分けするスクリプト。
+
+- `python grouping.py` : ALL_MEMBERS を 2-4 または 3-3 に分けて表示する
+- `python grouping.py --sessions N [--groups K | --sizes S ...] [--seed S] [--format csv|jsonl]`
+    : N 回分のグループ分けを1つのシード付き乱数から生成し、CSV / JSON Lines で書き出す。
+      1回分ずつ書き出すため、N が大きくても全体をメモリに持たない。
+      `--numpy` を付けると NumPy で N 回分の並べ替えを行列としてまとめて引く（NumPy が必要）。
+- `python grouping.py --sessions N --balanced [--history 過去.jsonl] ...`
+    : 過去に同じグループになった回数が少なくなるように分ける（PairHistory を参照）。
+      --history には --format jsonl で書き出したファイルを渡せる。
+"""
+
+import argparse
+import csv
+import json
 import random
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TextIO
 
 
 ALL_MEMBERS = ["A", "B", "C", "D", "E", "F"]
+NUMPY_CHUNK = 4096   # NumPy モードで1回に引くセッション数（行列の行数）
+MAX_PASSES = 20      # PairHistory.best_split() の局所探索で全ペアを見直す最大回数
+
+# 1回分のグループ分け（各グループはソート済み）
+Grouping = list[list[str]]
+
+
+def group_sizes(n: int, k: int) -> list[int]:
+    """n 人を k グループに、人数の差が高々1になるように分けたときの各グループの人数を返す。
+
+    先頭の n % k グループが1人多くなる。
+
+    Raises:
+        ValueError: k が1未満の場合
+    """
+    if k < 1:
+        raise ValueError(f"グループ数は1以上にしてください: {k}")
+    q, r = divmod(n, k)
+    return [q + 1] * r + [q] * (k - r)
+
+
+def _group_labels(n: int, sizes: Sequence[int] | int) -> tuple[list[int], list[int]]:
+    """(各グループの人数, グループ番号の列（0 を sizes[0] 個、1 を sizes[1] 個、…）) を返す。
+
+    Raises:
+        ValueError: 人数に負の値がある、または人数の合計が n と一致しない場合
+    """
+    if isinstance(sizes, int):
+        sizes = group_sizes(n, sizes)
+    if any(size < 0 for size in sizes) or sum(sizes) != n:
+        raise ValueError(f"{n} 人を {list(sizes)} に分けることはできません。")
+    return list(sizes), [g for g, size in enumerate(sizes) for _ in range(size)]
+
+
+def split_groups(
+    members: Sequence[str],
+    sizes: Sequence[int] | int,
+    rng: random.Random | None = None,
+) -> list[list[str]]:
+    """メンバーをランダムにグループ分けして返す。
+
+    挙動:
+        - sizes が整数 k なら、人数の差が高々1の k グループに分ける（group_sizes() を参照）。
+        - sizes が人数の並びなら、i 番目のグループを sizes[i] 人にする（合計は len(members)）。
+        - 各グループはソートされて返される。
+
+    メンバーを1回ソートし、グループ番号の列（0 を sizes[0] 個、1 を sizes[1] 個、…）を
+    1回シャッフル（Fisher–Yates）して、ソート済みのメンバーを順に各グループへ振り分ける。
+    集合演算もグループごとのソートも行わないため、ソート以外は O(n)。
+
+    Args:
+        members: 分けるメンバー（重複なし、比較可能であること）
+        sizes: 各グループの人数の並び、またはグループ数
+        rng: 乱数生成器。同じシードの random.Random を渡すと同じ結果になる。
+            None ならモジュールの random を使う
+
+    Returns:
+        list[list[str]]: グループのリスト（sizes と同じ順）
 
+    Raises:
+        ValueError: 人数に負の値がある、または人数の合計が len(members) と一致しない場合
+    """
+    sizes, labels = _group_labels(len(members), sizes)
+    (rng or random).shuffle(labels)
+
+    groups: list[list[str]] = [[] for _ in sizes]
+    for label, member in zip(labels, sorted(members)):
+        groups[label].append(member)
+    return groups
+
+
+def iter_groupings(
+    members: Sequence[str],
+    sizes: Sequence[int] | int,
+    n: int,
+    seed: int | None = None,
+    use_numpy: bool = False,
+) -> Iterator[Grouping]:
+    """1つのシード付き乱数から、n 回分のグループ分けを順に返す。
+
+    挙動:
+        - 各回の結果は split_groups(members, sizes, rng) と同じ形（グループごとにソート済み）。
+        - メンバーのソートとグループ番号の列の生成は最初の1回だけ行い、以降は列のシャッフルのみ。
+        - use_numpy=True なら NumPy の Generator で NUMPY_CHUNK 回分の並べ替えを
+          int 行列として一度に引く。同じ seed でも Python モードとは異なる結果になる。
+
+    Args:
+        members: 分けるメンバー
+        sizes: 各グループの人数の並び、またはグループ数
+        n: 生成する回数
+        seed: 乱数のシード。同じ値なら同じ並びになる。None なら毎回異なる
+        use_numpy: NumPy で一括生成するかどうか
+
+    Raises:
+        ValueError: 人数の指定が不正な場合（split_groups() と同じ）
+        ImportError: use_numpy=True で NumPy がインストールされていない場合
+    """
+    sizes, labels = _group_labels(len(members), sizes)
+    ordered = sorted(members)
+
+    if use_numpy:
+        yield from _iter_groupings_numpy(ordered, labels, len(sizes), n, seed)
+        return
+
+    rng = random.Random(seed)
+    for _ in range(n):
+        rng.shuffle(labels)
+        groups: Grouping = [[] for _ in sizes]
+        for label, member in zip(labels, ordered):
+            groups[label].append(member)
+        yield groups
+
+
+def _iter_groupings_numpy(
+    ordered: list[str], labels: list[int], k: int, n: int, seed: int | None
+) -> Iterator[Grouping]:
+    """iter_groupings() の NumPy モード。NUMPY_CHUNK 回分ずつ行ごとに並べ替えた行列から作る。"""
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError(
+            "--numpy / use_numpy=True には NumPy が必要です（pip install numpy）。"
+        ) from None
+
+    rng = np.random.default_rng(seed)
+    members = np.array(ordered, dtype=object)
+    base = np.array(labels, dtype=np.int32)
+    for start in range(0, n, NUMPY_CHUNK):
+        rows = min(NUMPY_CHUNK, n - start)
+        matrix = rng.permuted(np.broadcast_to(base, (rows, len(base))), axis=1)
+        for row in matrix:
+            yield [members[row == g].tolist() for g in range(k)]
+
+
+class PairHistory:
+    """過去のグループ分けで、各ペアが同じグループになった回数を持つクラス。
+
+    回数は n×n の対称行列で持ち、add() でそのグループ分けに含まれるペアの分だけ更新する
+    （行列を作り直すことはない）。best_split() はこの回数の合計が小さい分け方を探す。
+
+    使い方:
+        history = PairHistory(members)
+        for past in past_groupings:
+            history.add(past)
+        groups = history.best_split(3)
+        history.add(groups)
+    """
 
-def split_group():
+    def __init__(self, members: Iterable[str]) -> None:
+        """members（今回の名簿）で空の履歴を作る。"""
+        self.__members = sorted(members)
+        self.__index = {m: i for i, m in enumerate(self.__members)}
+        n = len(self.__members)
+        self.__counts = [[0] * n for _ in range(n)]
+        self.rounds = 0
+
+    @property
+    def members(self) -> list[str]:
+        return list(self.__members)
+
+    def add(self, grouping: Iterable[Iterable[str]]) -> None:
+        """1回分のグループ分けを履歴に加える。名簿に無いメンバーは無視する。
+
+        計算量はグループの人数の2乗の合計（名簿全体の人数には依存しない）。
+        """
+        index = self.__index
+        counts = self.__counts
+        for group in grouping:
+            ids = [index[m] for m in group if m in index]
+            for i, a in enumerate(ids):
+                row_a = counts[a]
+                for b in ids[i + 1 :]:
+                    row_a[b] += 1
+                    counts[b][a] += 1
+        self.rounds += 1
+
+    def count(self, a: str, b: str) -> int:
+        """a と b が同じグループになった回数を返す。"""
+        return self.__counts[self.__index[a]][self.__index[b]]
+
+    def cost(self, grouping: Iterable[Iterable[str]]) -> int:
+        """grouping の各グループ内の全ペアについて、過去に同じグループになった回数の合計を返す。"""
+        total = 0
+        for group in grouping:
+            group = list(group)
+            for i, a in enumerate(group):
+                total += sum(self.count(a, b) for b in group[i + 1 :])
+        return total
+
+    def best_split(
+        self,
+        sizes: Sequence[int] | int,
+        rng: random.Random | None = None,
+        max_passes: int = MAX_PASSES,
+    ) -> Grouping:
+        """名簿を、過去に同じグループになった回数の合計（cost()）が小さくなるように分けて返す。
+
+        挙動:
+            - ランダムな分け方から始め、違うグループの2人を入れ替えると合計が減る間、
+              入れ替えを繰り返す（局所探索。改善が無くなるか max_passes 回見直したら終了）。
+            - sums[m][g]（m とグループ g の各メンバーの回数の合計）を持っておくことで、
+              入れ替えによる増減は O(1)、入れ替え後の sums の更新は O(n) で済む。
+            - 戻り値の形は split_groups() と同じ（各グループはソート済み）。
+
+        Args:
+            sizes: 各グループの人数の並び、またはグループ数
+            rng: 乱数生成器（初期の分け方に使う）。None ならモジュールの random を使う
+            max_passes: 全ペアを見直す最大回数
+
+        Raises:
+            ValueError: 人数の指定が不正な場合（split_groups() と同じ）
+        """
+        n = len(self.__members)
+        sizes, labels = _group_labels(n, sizes)
+        (rng or random).shuffle(labels)
+        counts = self.__counts
+
+        by_group: list[list[int]] = [[] for _ in sizes]
+        for m, g in enumerate(labels):
+            by_group[g].append(m)
+        sums = [
+            [sum(map(row.__getitem__, ids)) for ids in by_group] for row in counts
+        ]
+
+        for _ in range(max_passes):
+            improved = False
+            for a in range(n):
+                row_a, sums_a = counts[a], sums[a]
+                for b in range(a + 1, n):
+                    ga, gb = labels[a], labels[b]
+                    if ga == gb:
+                        continue
+                    sums_b = sums[b]
+                    delta = (
+                        sums_a[gb] - sums_a[ga] + sums_b[ga] - sums_b[gb] - 2 * row_a[b]
+                    )
+                    if delta < 0:
+                        labels[a], labels[b] = gb, ga
+                        for row, sums_m in zip(counts, sums):
+                            d = row[a] - row[b]
+                            sums_m[ga] -= d
+                            sums_m[gb] += d
+                        improved = True
+            if not improved:
+                break
+
+        groups: Grouping = [[] for _ in sizes]
+        for label, member in zip(labels, self.__members):
+            groups[label].append(member)
+        return groups
+
+
+def iter_balanced_groupings(
+    members: Sequence[str],
+    sizes: Sequence[int] | int,
+    n: int,
+    seed: int | None = None,
+    history: PairHistory | None = None,
+) -> Iterator[Grouping]:
+    """同じペアが続けて同じグループにならないように、n 回分のグループ分けを順に返す。
+
+    各回を PairHistory.best_split() で決め、その結果を history に加えてから次の回に進む。
+    history を渡すと、その履歴（過去の回）も考慮し、生成した回も追記される。
+
+    Args:
+        members: 分けるメンバー（history を渡す場合は無視し、その名簿を使う）
+        sizes: 各グループの人数の並び、またはグループ数
+        n: 生成する回数
+        seed: 乱数のシード。同じ値（と同じ履歴）なら同じ並びになる
+        history: 過去のグループ分けの履歴。None なら空の履歴から始める
+    """
+    history = PairHistory(members) if history is None else history
+    rng = random.Random(seed)
+    for _ in range(n):
+        groups = history.best_split(sizes, rng)
+        history.add(groups)
+        yield groups
+
+
+def read_jsonl(f: TextIO) -> Iterator[Grouping]:
+    """write_jsonl() で書き出したファイルから、グループ分けを順に返す。"""
+    for line in f:
+        if line.strip():
+            yield json.loads(line)["groups"]
+
+
+def write_csv(groupings: Iterable[Grouping], out: TextIO) -> int:
+    """グループ分けを1回1行の CSV で書き出し、書き出した回数を返す。
+
+    列は session, group1, group2, ... で、グループ内のメンバーは空白区切り。
+    """
+    writer = csv.writer(out, lineterminator="\n")
+    count = 0
+    for count, groups in enumerate(groupings, 1):
+        if count == 1:
+            writer.writerow(["session", *(f"group{g}" for g in range(1, len(groups) + 1))])
+        writer.writerow([count, *(" ".join(group) for group in groups)])
+    return count
+
+
+def write_jsonl(groupings: Iterable[Grouping], out: TextIO) -> int:
+    """グループ分けを1回1行の JSON（{"session": i, "groups": [...]}）で書き出し、書き出した回数を返す。"""
+    count = 0
+    for count, groups in enumerate(groupings, 1):
+        out.write(json.dumps({"session": count, "groups": groups}, ensure_ascii=False))
+        out.write("\n")
+    return count
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl}
+
+
+def split_group(rng: random.Random | None = None):
     """メンバーをランダムに 2-4 または 3-3 に分割して返す。
 
     各グループはアルファベット順にソートされて返される。
 
+    Args:
+        rng: 乱数生成器（split_groups() と同じ）。None ならモジュールの random を使う
+
     Returns:
         tuple[list[str], list[str]]: 2つのグループのリスト
     """
-    size = random.choice([2, 3])
-    g1 = sorted(random.sample(ALL_MEMBERS, size))
-    g2 = sorted(set(ALL_MEMBERS) - set(g1))
+    size = (rng or random).choice([2, 3])
+    g1, g2 = split_groups(ALL_MEMBERS, [size, len(ALL_MEMBERS) - size], rng)
     return g1, g2
 
 
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する。--sessions が無ければ従来どおり split_group() の結果を表示する。"""
+    parser = argparse.ArgumentParser(description="メンバーをランダムにグループ分けする。")
+    parser.add_argument("--sessions", type=int, help="生成する回数（指定時は CSV / JSONL で書き出す）")
+    parser.add_argument("--members", nargs="+", default=ALL_MEMBERS, help="メンバー（既定 A〜F）")
+    parser.add_argument("--members-file", help="1行1人のメンバー一覧ファイル（--members より優先）")
+    split = parser.add_mutually_exclusive_group()
+    split.add_argument("--groups", type=int, default=2, help="グループ数（既定 2、人数はほぼ均等）")
+    split.add_argument("--sizes", type=int, nargs="+", help="各グループの人数")
+    parser.add_argument("--seed", type=int, help="乱数のシード（同じ値なら同じ結果）")
+    parser.add_argument("--numpy", action="store_true", help="NumPy で一括生成する")
+    parser.add_argument(
+        "--balanced", action="store_true", help="過去に同じグループになった回数が少なくなるように分ける"
+    )
+    parser.add_argument("--history", help="--balanced で考慮する過去のグループ分け（JSONL）")
+    parser.add_argument("--format", choices=tuple(WRITERS), default="csv")
+    parser.add_argument("--out", help="出力先ファイル（既定は標準出力）")
+    args = parser.parse_args(argv)
+    if args.numpy and args.balanced:
+        parser.error("--numpy と --balanced は同時に指定できません。")
+    if args.history and not args.balanced:
+        parser.error("--history は --balanced と一緒に指定してください。")
+    return args
+
+
+def main() -> None:
+    """エントリーポイント。"""
+    args = parse_args()
+    if args.sessions is None:
+        g1, g2 = split_group()
+        print(g1)
+        print(g2)
+        return
+
+    members = args.members
+    if args.members_file:
+        with open(args.members_file, encoding="utf-8") as f:
+            members = [line.strip() for line in f if line.strip()]
+
+    sizes = args.sizes or args.groups
+    if args.balanced:
+        history = PairHistory(members)
+        if args.history:
+            with open(args.history, encoding="utf-8") as f:
+                for grouping in read_jsonl(f):
+                    history.add(grouping)
+        groupings = iter_balanced_groupings(members, sizes, args.sessions, args.seed, history)
+    else:
+        groupings = iter_groupings(members, sizes, args.sessions, args.seed, args.numpy)
+    out = open(args.out, "w", encoding="utf-8", newline="") if args.out else sys.stdout
+    try:
+        WRITERS[args.format](groupings, out)
+    except (ValueError, ImportError) as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
 if __name__ == "__main__":
-    g1, g2 = split_group()
-    print(g1)
-    print(g2)
+    main()
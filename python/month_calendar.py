@@ -0,0 +1,444 @@
+"""月曜始まり・cal風のカレンダーを文字列として描画するライブラリ（calendar.py の描画部分）。
+
+標準ライブラリの calendar と名前が衝突しないよう、calendar.py とは別の名前にしている。
+このディレクトリを sys.path に入れて import しても、標準ライブラリの calendar を使う
+モジュール（http.cookiejar など）は壊れない。コマンドラインと `--serve` は calendar.py が担う。
+
+- 曜日見出しは日本語、表示は6行×7列、日付は2桁右寄せ、タイトルは幅20で中央寄せ。
+- 月初の曜日は Sakamoto 法、月末日は閏年判定＋表引きで求める（datetime は使わない）。
+  複数月の表示では、2か月目以降の月初の曜日を前の月から順に求める。
+
+日付の配置は書式に依存しない MonthGrid（42セルの整数配列、0 は空き）として
+(月初の曜日, 月末日) ごとにキャッシュし、各書式のレンダラー（RENDERERS）はそれを共有する。
+
+使い方（標準出力・sys.argv・sys.exit に触れず、文字列を返すだけ）:
+    render_month(2025, 2, highlight=14)      -> 1か月分の文字列
+    render_month(2025, 2, 14, fmt="json")    -> 同じ月の JSON
+    render_months([(2025, 1), (2025, 2, 3)]) -> 各月の文字列のリスト
+    render_month_range((2025, 1), (2025, 12), today=date.today()) -> 3か月ずつ横に並べた文字列
+いずれもモジュール内の状態を書き換えないため、複数スレッドから同時に呼び出してよい。
+日付計算は datetime に依存しないため、1..9999 年の範囲外の年も描画できる
+（calendar.py の -y / -r は cal に合わせて 1..9999 年に制限している）。
+"""
+import html
+import json
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import date
+from functools import lru_cache
+from typing import NamedTuple, TypeAlias
+
+
+DAY_OF_WEEK_L = ["月", "火", "水", "木", "金", "土", "日"]
+WEEK_HEADER = " ".join(DAY_OF_WEEK_L)
+MONTH_WIDTH = 20      # 1か月分の表示幅（タイトル・各週の行）
+MONTHS_PER_ROW = 3    # 複数月表示で横に並べる月数
+MONTH_GAP = "  "      # 横に並べた月と月の間
+DEFAULT_FORMAT = "ansi"
+
+Weeks: TypeAlias = tuple[tuple[str, ...], ...]  # 週（最大7セル）× 最大6行
+class Color:
+    REVERSE = '\033[07m' #文字色と背景色を反転
+    RESET = '\033[0m'    #全てリセット
+
+
+# 月ごとの日数（添字0は未使用）。[平年, 閏年] の順。
+MONTH_LENGTHS = (
+    (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+    (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+)
+# Sakamoto 法の月ごとの補正値（添字0は未使用）
+_SAKAMOTO_OFFSETS = (0, 0, 3, 2, 5, 0, 3, 5, 1, 4, 6, 2, 4)
+
+
+def is_leap_year(this_year: int) -> bool:
+    """与えられた西暦年が閏年かを判定する（先発グレゴリオ暦。0年や負の年も可）。
+
+    判定規則:
+        - 400で割り切れる年は閏年
+        - 100で割り切れる年は平年
+        - 4で割り切れる年は閏年
+        - それ以外は平年
+
+    3つの条件の排他的論理和で、分岐なしに上の規則と同じ結果になる
+    （4の倍数 ^ 100の倍数 ^ 400の倍数）。
+
+    Args:
+        this_year (int): 判定する年
+
+    Returns:
+        bool: 閏年なら True、平年なら False
+    """
+    return (this_year % 4 == 0) ^ (this_year % 100 == 0) ^ (this_year % 400 == 0)
+
+
+def days_in_month(this_year: int, this_month: int) -> int:
+    """その月の日数（月末日）を返す。2月は閏年を考慮する（MONTH_LENGTHS を引くだけ）。"""
+    return MONTH_LENGTHS[is_leap_year(this_year)][this_month]
+
+
+def first_weekday_of(this_year: int, this_month: int) -> int:
+    """その月の1日の曜日（0=月, …, 6=日）を Sakamoto 法で求める。
+
+    datetime を使わないため 1..9999 年の範囲外（0年や負の年、10000年以降）でも
+    先発グレゴリオ暦として計算できる。
+
+    Args:
+        this_year (int): 西暦年
+        this_month (int): 月（1..12）
+
+    Returns:
+        int: 月初の曜日（0=月, 1=火, …, 6=日）※ datetime.weekday() 準拠
+    """
+    y = this_year - (this_month < 3)
+    sunday_based = (y + y // 4 - y // 100 + y // 400 + _SAKAMOTO_OFFSETS[this_month] + 1) % 7
+    return (sunday_based + 6) % 7
+
+
+def month_table(start: tuple[int, int], end: tuple[int, int]) -> tuple[array, array]:
+    """start から end までの全月の (月初の曜日, 月末日) を1回の呼び出しでまとめて求める。
+
+    数千か月分を描画する前に一括で求めておくためのバッチ版。最初の月だけ
+    first_weekday_of() で求め、以降は前の月から順に足し込む。
+
+    Returns:
+        tuple[array, array]: 月初の曜日の array('b') と、月末日の array('b')（どちらも月順）
+    """
+    first_weekdays = array("b")
+    lengths = array("b")
+    for _, _, first_weekday, end_of_month in iter_months(start, end):
+        first_weekdays.append(first_weekday)
+        lengths.append(end_of_month)
+    return first_weekdays, lengths
+
+
+def iter_months(start: tuple[int, int], end: tuple[int, int]) -> Iterator[tuple[int, int, int, int]]:
+    """start から end までの各月について (年, 月, 月初の曜日, 月末日) を順に返す。
+
+    最初の月の曜日だけ first_weekday_of() で求め、以降は
+    「翌月の月初の曜日 = (今月の月初の曜日 + 今月の日数) % 7」で順に求める。
+
+    Args:
+        start (tuple[int, int]): 開始の (年, 月)
+        end (tuple[int, int]): 終了の (年, 月)（この月を含む）
+    """
+    year, month = start
+    first_weekday = first_weekday_of(year, month)
+    while (year, month) <= end:
+        end_of_month = days_in_month(year, month)
+        yield year, month, first_weekday, end_of_month
+        first_weekday = (first_weekday + end_of_month) % 7
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class MonthGrid(NamedTuple):
+    """書式に依存しない1か月分の日付配置（6行×7列＝42セル）。
+
+    days は月曜始まりで左上から順に並べた日付で、空きセルは 0。
+    ハイライト（今日）はリクエストごとに違うため、グリッドには持たせず
+    レンダラーに「日」として別に渡す（セル位置は cell_index() で求まる）。
+    """
+
+    first_weekday: int
+    end_of_month: int
+    days: tuple[int, ...]
+
+    def cell_index(self, day: int | None) -> int | None:
+        """day のセル位置（0..41）を返す。範囲外・None なら None。"""
+        if day is None or not (1 <= day <= self.end_of_month):
+            return None
+        return self.first_weekday + day - 1
+
+    def weeks(self) -> tuple[tuple[int, ...], ...]:
+        """6週ぶんの日付（空きは 0）を週ごとに返す。"""
+        return tuple(self.days[i:i+7] for i in range(0, 42, 7))
+
+
+@lru_cache(maxsize=None)
+def month_grid(first_weekday: int, end_of_month: int) -> MonthGrid:
+    """(月初の曜日, 月末日) の MonthGrid を返す。
+
+    引数は first_weekday（7通り）× end_of_month（4通り）の高々28通りしかないため、
+    全件をキャッシュしても28個で頭打ちになる。各書式のレンダラーはこれを共有する。
+    """
+    days = (0,)*first_weekday + tuple(range(1, end_of_month + 1))
+    return MonthGrid(first_weekday, end_of_month, days + (0,)*(42 - len(days)))
+
+
+@lru_cache(maxsize=None)
+def _base_weeks(first_weekday: int, end_of_month: int) -> Weeks:
+    """ハイライト無しの週配列（不変）を month_grid() から作って返す（28通りでキャッシュ）。"""
+    grid = month_grid(first_weekday, end_of_month)
+    # 先頭の空きを first_weekday個だけ "  " で埋めて、1日〜月末を後ろに並べる
+    days = tuple("  " if v == 0 else f"{v:>2}" for v in grid.days[:first_weekday + end_of_month])
+    # 6行×7列で固定（cal準拠）。7日ごとにスライスして週を作る。
+    # 1行の横幅は (2桁の数字 + 区切りスペース1)×7 - 1 = 20 文字
+    return tuple(days[i:i+7] for i in range(0, 42, 7))
+
+
+def generate_monthly_weeks(first_weekday: int, end_of_month: int,  highlight_day: int | None) -> Weeks:
+    """月初の曜日と月末日をもとに、cal風（最大6行×7列）の週配列を生成する。
+
+    仕様:
+        - 出力は「週」を単位とした二次元タプル（各行が1週間、各要素が日付文字列）。
+        - 日付は2桁右寄せ。先頭の空きは "  "（半角スペース2つ）で埋める。
+        - `highlight_day` が指定されている場合、その「日」に
+          反転表示（Color.REVERSE ... Color.RESET）を付与する。
+        - 行数は最大6行（6×7=42セル）に整形する。
+        - ハイライト無しの週配列は _base_weeks() のキャッシュをそのまま返し、
+          ハイライト有りの場合もその「日」を含む1週だけを作り直す。
+
+    Args:
+        first_weekday (int): 月初の曜日（0=月, 1=火, …, 6=日）※ datetime.weekday() 準拠
+        end_of_month (int): その月の最終日（28, 29, 30, 31 のいずれか）
+        highlight_day (int | None): 反転表示する「日」。ハイライトしない場合は None
+
+    Returns:
+        Weeks: 週ごとの文字列タプルを並べた二次元タプル（最大6行×7列）。共有されるため変更しないこと。
+    """
+    weeks = _base_weeks(first_weekday, end_of_month)
+    if highlight_day is None or not (1 <= highlight_day <= end_of_month):
+        return weeks
+
+    # ハイライトする日のセル位置（週, 曜日）だけ差し替える
+    row, col = divmod(first_weekday + highlight_day - 1, 7)
+    week = weeks[row]
+    cell = f"{Color.REVERSE}{week[col]}{Color.RESET}"
+    return weeks[:row] + (week[:col] + (cell,) + week[col+1:],) + weeks[row+1:]
+
+
+def format_month(this_year: int, this_month_jp: str, weeks_l: Weeks) -> str:
+    """タイトル・曜日見出し・週配列を1つの文字列にする（cal風、末尾に改行あり）。
+
+    レイアウト:
+        - タイトルは幅20で中央寄せ（例: "      1月 2025      "）
+        - 見出しはグローバル定数 WEEK_HEADER を使用
+        - 各週（tuple[str, ...]）はスペース区切りで結合して1行
+
+    Args:
+        this_year (int): 表示する西暦年
+        this_month_jp (str): 表示する月の日本語表記（例: "2月"）
+        weeks_l (Weeks): generate_monthly_weeks の出力（週ごとの二次元タプル）
+    """
+    title = f"{this_month_jp} {this_year}".center(20)
+    return "\n".join([title, WEEK_HEADER, *(" ".join(w) for w in weeks_l), ""])
+
+
+def render_plain(year: int, month: int, grid: MonthGrid, highlight: int | None) -> str:
+    """プレーンテキスト（エスケープ無し）で1か月分を描画する。ハイライトは付けない。"""
+    weeks_l = generate_monthly_weeks(grid.first_weekday, grid.end_of_month, None)
+    return format_month(year, f"{month}月", weeks_l)
+
+
+def render_ansi(year: int, month: int, grid: MonthGrid, highlight: int | None) -> str:
+    """端末向けに、highlight の日を反転表示（ANSI エスケープ）して1か月分を描画する。"""
+    weeks_l = generate_monthly_weeks(grid.first_weekday, grid.end_of_month, highlight)
+    return format_month(year, f"{month}月", weeks_l)
+
+
+def month_dict(year: int, month: int, grid: MonthGrid, highlight: int | None) -> dict:
+    """1か月分を JSON にできる辞書にする（weeks は 6×7、空きは None）。"""
+    return {
+        "year": year,
+        "month": month,
+        "first_weekday": grid.first_weekday,
+        "end_of_month": grid.end_of_month,
+        "weekdays": DAY_OF_WEEK_L,
+        "weeks": [[v or None for v in week] for week in grid.weeks()],
+        "highlight": highlight if grid.cell_index(highlight) is not None else None,
+    }
+
+
+def render_json(year: int, month: int, grid: MonthGrid, highlight: int | None) -> str:
+    """1か月分を1行の JSON（末尾に改行あり）で描画する。"""
+    return json.dumps(month_dict(year, month, grid, highlight), ensure_ascii=False) + "\n"
+
+
+def render_html(year: int, month: int, grid: MonthGrid, highlight: int | None) -> str:
+    """1か月分を HTML の <table> で描画する。ハイライトの日は class="today" を付ける。"""
+    today_index = grid.cell_index(highlight)
+    lines = [
+        '<table class="calendar">',
+        f"<caption>{month}月 {year}</caption>",
+        "<thead><tr>" + "".join(f"<th>{html.escape(d)}</th>" for d in DAY_OF_WEEK_L) + "</tr></thead>",
+        "<tbody>",
+    ]
+    for row, week in enumerate(grid.weeks()):
+        if not any(week):
+            continue
+        cells = []
+        for col, v in enumerate(week):
+            if v == 0:
+                cells.append("<td></td>")
+            elif row * 7 + col == today_index:
+                cells.append(f'<td class="today">{v}</td>')
+            else:
+                cells.append(f"<td>{v}</td>")
+        lines.append("<tr>" + "".join(cells) + "</tr>")
+    lines += ["</tbody>", "</table>", ""]
+    return "\n".join(lines)
+
+
+# 書式名 → レンダラー（引数はいずれも (年, 月, MonthGrid, ハイライトする日)）
+RENDERERS = {
+    "plain": render_plain,
+    "ansi": render_ansi,
+    "json": render_json,
+    "html": render_html,
+}
+
+
+def month_block(title: str, weeks_l: Weeks) -> list[str]:
+    """1か月分を、横に並べるための固定幅（MONTH_WIDTH）の8行にする。
+
+    各週の行は反転表示のエスケープを含むことがあるため、文字数ではなく
+    セル数から見た目の幅を求めて右側を空白で埋める。
+    """
+    return [title.center(MONTH_WIDTH), WEEK_HEADER, *map(_padded_week_line, weeks_l)]
+
+
+@lru_cache(maxsize=256)
+def _padded_week_line(week: tuple[str, ...]) -> str:
+    """1週分のセルを MONTH_WIDTH 幅の1行にする（同じ週の行は使い回す）。"""
+    visible_width = len(week) * 3 - 1 if week else 0
+    return " ".join(week) + " " * (MONTH_WIDTH - visible_width)
+
+
+def iter_month_rows(blocks: Iterable[list[str]]) -> Iterator[str]:
+    """month_block() の並びを MONTHS_PER_ROW か月ずつ横に並べ、1段ずつ文字列で返す（cal -y 風）。
+
+    各段は行を1回の join でまとめた文字列（末尾に改行あり）。段と段の間には空行を1行入れる。
+    """
+    row: list[list[str]] = []
+    first_row = True
+    for block in blocks:
+        row.append(block)
+        if len(row) == MONTHS_PER_ROW:
+            yield _format_row(row, first_row)
+            row, first_row = [], False
+    if row:
+        yield _format_row(row, first_row)
+
+
+def _format_row(row: list[list[str]], first_row: bool) -> str:
+    """横に並べる1段分（最大 MONTHS_PER_ROW か月）を1つの文字列にする。"""
+    lines = [] if first_row else [""]
+    for cells in zip(*row):
+        line = MONTH_GAP.join(cells).rstrip()
+        if line:  # どの月も5週で終わる段では6週目の空行を出さない
+            lines.append(line)
+    lines.append("")
+    return "\n".join(lines)
+
+
+def render_month(year: int, month: int, highlight: int | None = None, fmt: str = DEFAULT_FORMAT) -> str:
+    """1か月分のカレンダーを文字列で返す（既定の ansi は `python calendar.py -m` と同じ見た目）。
+
+    Args:
+        year (int): 西暦年
+        month (int): 月（1..12）
+        highlight (int | None): 反転表示する「日」。ハイライトしない場合は None
+        fmt (str): 出力書式（RENDERERS のキー: plain / ansi / json / html）
+
+    Returns:
+        str: 指定書式で描画した文字列（末尾に改行あり）
+
+    Raises:
+        ValueError: month が 1..12 でない場合、または fmt が RENDERERS に無い場合
+    """
+    _check_month(month)
+    renderer = _renderer(fmt)
+    grid = month_grid(first_weekday_of(year, month), days_in_month(year, month))
+    return renderer(year, month, grid, highlight)
+
+
+def render_months(months: Iterable[tuple[int, int] | tuple[int, int, int | None]], fmt: str = DEFAULT_FORMAT) -> list[str]:
+    """複数の月をまとめて render_month() し、各月の文字列のリストを返す。
+
+    Args:
+        months: (年, 月) または (年, 月, ハイライトする日) の並び
+        fmt (str): 出力書式（RENDERERS のキー）
+
+    Returns:
+        list[str]: 各月の render_month() の結果（入力と同じ順）
+
+    Raises:
+        ValueError: 月が 1..12 でないものがある場合、または fmt が RENDERERS に無い場合
+    """
+    return [render_month(*m, fmt=fmt) for m in months]
+
+
+def _check_month(month: int) -> None:
+    """month が 1..12 でなければ ValueError。"""
+    if not (1 <= month <= 12):
+        raise ValueError(f"month must be in 1..12: {month}")
+
+
+def _renderer(fmt: str):
+    """書式名に対応するレンダラーを返す。無ければ ValueError。"""
+    try:
+        return RENDERERS[fmt]
+    except KeyError:
+        raise ValueError(f"unknown format: {fmt}") from None
+
+
+def render_month_range(start: tuple[int, int], end: tuple[int, int], today: date | None = None, year_view: bool = False, fmt: str = DEFAULT_FORMAT) -> str:
+    """start から end までの月を描画した文字列を返す（`-y` / `-r` と同じ見た目）。
+
+    plain / ansi は3か月ずつ横に並べ、json / html は1か月ずつ縦に並べる（json は1行1か月）。
+
+    Args:
+        start (tuple[int, int]): 開始の (年, 月)
+        end (tuple[int, int]): 終了の (年, 月)（この月を含む）
+        today (date | None): この日を含む月ではその日を反転表示する。None ならハイライトしない
+        year_view (bool): True なら先頭に年の見出しを付け、各月のタイトルを月のみにする（`-y`、plain / ansi のみ）
+        fmt (str): 出力書式（RENDERERS のキー）
+
+    Returns:
+        str: 全行を改行で連結した文字列（末尾に改行あり）
+
+    Raises:
+        ValueError: start / end の月が 1..12 でない場合、または fmt が RENDERERS に無い場合
+    """
+    return "".join(iter_month_range_chunks(start, end, today, year_view, fmt))
+
+
+def iter_month_range_chunks(start: tuple[int, int], end: tuple[int, int], today: date | None = None, year_view: bool = False, fmt: str = DEFAULT_FORMAT) -> Iterator[str]:
+    """render_month_range() の出力を、見出しと「3か月の段」（json / html は1か月）ごとに分けて順に返す。
+
+    長い範囲でも全体を組み立て終わるのを待たずに、段ごとに書き出せる。
+    引数と例外は render_month_range() と同じ（引数の検査は最初の段を取り出す前、呼び出した時点で行う）。
+    """
+    _check_month(start[1])
+    _check_month(end[1])
+    return _iter_month_range_chunks(start, end, today, year_view, _renderer(fmt))
+
+
+def _iter_month_range_chunks(start: tuple[int, int], end: tuple[int, int], today: date | None, year_view: bool, renderer) -> Iterator[str]:
+    """iter_month_range_chunks() の本体（引数は検査済み）。"""
+
+    def highlight_for(this_year: int, this_month: int) -> int | None:
+        if today is None or (this_year, this_month) != (today.year, today.month):
+            return None
+        return today.day
+
+    if renderer not in (render_plain, render_ansi):
+        for this_year, this_month, first_weekday, end_of_month in iter_months(start, end):
+            grid = month_grid(first_weekday, end_of_month)
+            yield renderer(this_year, this_month, grid, highlight_for(this_year, this_month))
+        return
+
+    if year_view:
+        width = MONTH_WIDTH * MONTHS_PER_ROW + len(MONTH_GAP) * (MONTHS_PER_ROW - 1)
+        yield f"{start[0]}".center(width).rstrip() + "\n\n"
+
+    if renderer is render_plain:
+        today = None
+    blocks = (
+        month_block(
+            f"{this_month}月" if year_view else f"{this_month}月 {this_year}",
+            generate_monthly_weeks(first_weekday, end_of_month, highlight_for(this_year, this_month)),
+        )
+        for this_year, this_month, first_weekday, end_of_month in iter_months(start, end)
+    )
+    yield from iter_month_rows(blocks)
@@ -0,0 +1,101 @@
+"""在庫表現ごとのメモリ使用量を tracemalloc で計測するベンチマーク。
+
+挙動:
+    - 1本あたり: 1M 本（--bottles で変更可）の在庫を次の3通りで作り、確保量を比べる。
+        * dict_drink_deque : `__dict__` を持つ Drink を1本ずつ作り deque に入れる（従来の形）
+        * slots_drink_deque: `__slots__` の Drink を1本ずつ作り deque に入れる
+        * drink_stock      : Drink 1つ + 本数（DrinkStock、現在の形）
+    - 1商品あたり: 100k 商品（--products で変更可）を次の2通りで作り、確保量を比べる。
+        * list_record   : [brand, price, stock] のリスト（従来の形）
+        * product_record: Product（dataclass(slots=True)、現在の形）
+    - 各計測は tracemalloc の増分（計測開始からのピーク）で、ブランド名の文字列などの
+      共有オブジェクトは計測前に作っておく。
+
+使用例:
+    $ python bench_inventory_memory.py
+    $ python bench_inventory_memory.py --bottles 100000 --products 10000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from collections import deque
+from collections.abc import Callable
+
+from drink import Drink
+from drink_stock import DrinkStock
+from product import Product
+
+DEFAULT_BOTTLES = 1_000_000
+DEFAULT_PRODUCTS = 100_000
+
+
+class DictDrink:
+    """比較用：`__slots__` を持たない従来の Drink。"""
+
+    def __init__(self, brand: str, price: int) -> None:
+        self.__brand = brand
+        self.__price = price
+
+
+def measure(build: Callable[[], object]) -> tuple[int, int]:
+    """build() が確保したメモリ（現在量, ピーク）をバイトで返す。結果は計測後に捨てる。"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def bottle_cases(n: int, brand: str, price: int) -> dict[str, Callable[[], object]]:
+    """1本あたりの比較対象（名前 → 在庫を作る関数）を返す。"""
+    return {
+        "dict_drink_deque": lambda: deque(DictDrink(brand, price) for _ in range(n)),
+        "slots_drink_deque": lambda: deque(Drink(brand, price) for _ in range(n)),
+        "drink_stock": lambda: DrinkStock(Drink(brand, price), n),
+    }
+
+
+def product_cases(n: int, brands: list[str]) -> dict[str, Callable[[], object]]:
+    """1商品あたりの比較対象（名前 → 商品一覧を作る関数）を返す。
+
+    在庫は空の DrinkStock で揃え、レコード自体の差だけを見る。
+    """
+    return {
+        "list_record": lambda: {
+            i: [b, 100, DrinkStock(Drink(b, 100))] for i, b in enumerate(brands)
+        },
+        "product_record": lambda: {
+            i: Product(b, 100, DrinkStock(Drink(b, 100))) for i, b in enumerate(brands)
+        },
+    }
+
+
+def print_table(title: str, n: int, cases: dict[str, Callable[[], object]]) -> None:
+    """cases を順に計測して、合計と1件あたりのバイト数を表示する。"""
+    print(f"■{title}（{n:,} 件）")
+    print(f"{'case':<20} {'current(B)':>14} {'peak(B)':>14} {'B/件':>10}")
+    for name, build in cases.items():
+        current, peak = measure(build)
+        print(f"{name:<20} {current:>14,} {peak:>14,} {current / n:>10.1f}")
+    print()
+
+
+def main() -> None:
+    """エントリーポイント。"""
+    parser = argparse.ArgumentParser(description="在庫表現ごとのメモリ使用量の比較")
+    parser.add_argument("--bottles", type=int, default=DEFAULT_BOTTLES)
+    parser.add_argument("--products", type=int, default=DEFAULT_PRODUCTS)
+    args = parser.parse_args()
+
+    print_table("1本あたり", args.bottles, bottle_cases(args.bottles, "ペプシ", 150))
+    brands = [f"商品{i}" for i in range(args.products)]
+    print_table("1商品あたり", args.products, product_cases(args.products, brands))
+
+
+if __name__ == "__main__":
+    main()
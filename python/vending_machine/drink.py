@@ -2,8 +2,11 @@ class Drink:
     """ドリンクを表すクラス。
 
     ブランド名と価格を保持するだけのシンプルな値オブジェクト。
+    `__slots__` を使うため、インスタンスごとの `__dict__` を持たない。
     """
 
+    __slots__ = ("__brand", "__price")
+
     def __init__(self, brand: str, price: int) -> None:
         self.__brand = brand
         self.__price = price
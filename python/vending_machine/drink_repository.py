@@ -1,4 +1,10 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from drink import Drink
+from drink_stock import DrinkStock
+from product import Product
 
 
 class SoldOutError(Exception):
@@ -25,29 +31,51 @@ class ProductNotFoundError(KeyError):
 class DrinkRepository:
     """ドリンク在庫を管理するリポジトリ。
 
-    在庫は `dict[int, list]` として保持する。
-    各要素は `[brand: str, price: int, drinks: deque[Drink]]` の並びを想定する。
+    在庫は `dict[int, Product]` として保持する。
+    在庫数は DrinkStock が整数で持つため、補充・販売は本数によらず O(1) で、Drink を作らない。
+
+    在庫や価格が変わるたびに `version` を1増やす。一覧から作る派生データ（購入可能な商品など）は、
+    `version` が前回と同じなら作り直さなくてよい。
+
+    在庫が1本以上ある商品は (price, product_id) の昇順リストでも持ち、販売・補充・価格変更の
+    たびに差分だけ更新する。find_affordable() はこのリストを二分探索する。
     """
 
-    def __init__(self, inventory: dict[int, list]) -> None:
+    def __init__(self, inventory: dict[int, Product]) -> None:
         """リポジトリを初期化する。
 
         Args:
-            inventory: product_id をキーに、[brand, price, deque(Drink)] を値に持つ辞書。
+            inventory: product_id をキーに、Product を値に持つ辞書。
         """
         self.__inventory = inventory
-
-    def get_all(self) -> dict[int, list]:
+        self.__view = MappingProxyType(inventory)
+        self.__version = 0
+        # 在庫ありの商品の (price, product_id)（昇順）と、各商品の登録順
+        self.__in_stock_by_price = sorted(
+            (product.price, product_id)
+            for product_id, product in inventory.items()
+            if product.stock
+        )
+        self.__position = {product_id: i for i, product_id in enumerate(inventory)}
+
+    @property
+    def version(self) -> int:
+        """在庫の版。販売・補充・価格変更のたびに1増える。"""
+        return self.__version
+
+    def get_all(self) -> Mapping[int, Product]:
         """取扱商品一覧を取得する。
 
         Returns:
-            在庫辞書の浅いコピー。各商品の `deque[Drink]` は共有される点に注意。
+            在庫辞書の読み取り専用ビュー（コピーしないため O(1)）。
+            以降の販売・補充はこのビューにもそのまま反映される。
 
         Note:
-            呼び出し側で `get_all()[id][2].append(...)` などを行うと
-            内部状態に影響する（浅いコピーのため）。
+            各商品の `Product` は共有されるため、呼び出し側で
+            `get_all()[id].stock.add(...)` などを行うと内部状態に影響する
+            （`version` も増えない）。在庫の変更はリポジトリのメソッドで行うこと。
         """
-        return self.__inventory.copy()
+        return self.__view
 
     def get_price(self, product_id: int) -> int:
         """商品価格を取得する。
@@ -64,7 +92,7 @@ class DrinkRepository:
         if product_id not in self.__inventory:
             raise ProductNotFoundError(product_id)
 
-        return self.__inventory[product_id][1]
+        return self.__inventory[product_id].price
 
     def decrease_stock(self, product_id: int) -> Drink:
         """指定商品の在庫を1本減らし、そのドリンクを返す。
@@ -82,24 +110,116 @@ class DrinkRepository:
         if product_id not in self.__inventory:
             raise ProductNotFoundError(product_id)
 
-        brand, _, drinks = self.__inventory[product_id]
-        if not drinks:
-            raise SoldOutError(f"■{brand}は売り切れです。")
+        product = self.__inventory[product_id]
+        if not product.stock:
+            raise SoldOutError(f"■{product.brand}は売り切れです。")
+
+        drink = product.stock.take()
+        if not product.stock:
+            self.__remove_from_index(product_id, product.price)
+        self.__version += 1
+        return drink
+
+    def decrease_stock_many(self, quantities: Mapping[int, int]) -> dict[int, Drink]:
+        """複数の商品の在庫をまとめて減らし、商品ごとのドリンクを返す。
+
+        先に全商品の存在と在庫数を確かめてから減らすため、
+        例外が発生した場合はどの商品の在庫も変わらない。
+
+        Args:
+            quantities: 商品ID → 減らす本数（1以上）。
+
+        Returns:
+            商品ID → その商品の `Drink` の辞書（quantities と同じ並び）。
 
-        return drinks.popleft()
+        Raises:
+            ProductNotFoundError: 存在しない商品IDが含まれる場合。
+            SoldOutError: 在庫が指定本数に満たない商品がある場合。
+        """
+        for product_id, quantity in quantities.items():
+            if product_id not in self.__inventory:
+                raise ProductNotFoundError(product_id)
+            product = self.__inventory[product_id]
+            if not product.stock:
+                raise SoldOutError(f"■{product.brand}は売り切れです。")
+            if len(product.stock) < quantity:
+                raise SoldOutError(
+                    f"■{product.brand}の在庫が足りません（残り{len(product.stock)}本）。"
+                )
+
+        drinks: dict[int, Drink] = {}
+        for product_id, quantity in quantities.items():
+            product = self.__inventory[product_id]
+            drinks[product_id] = product.stock.take(quantity)
+            if not product.stock:
+                self.__remove_from_index(product_id, product.price)
+        self.__version += 1
+        return drinks
 
     def increase_stock(self, product_id: int, quantity: int) -> None:
         """指定商品の在庫を quantity 本追加する。
 
         Args:
             product_id: 対象商品のID。
-            quantity: 追加本数（1以上を想定）。
+            quantity: 追加本数（1以上を想定。0 なら何もしない）。
+
+        Raises:
+            ProductNotFoundError: 指定IDの商品が存在しない場合。
+            ValueError: quantity が負の場合（在庫は変えない）。
+        """
+        if product_id not in self.__inventory:
+            raise ProductNotFoundError(product_id)
+
+        product = self.__inventory[product_id]
+        was_empty = not product.stock
+        product.stock.add(quantity)
+        if was_empty and product.stock:
+            insort(self.__in_stock_by_price, (product.price, product_id))
+        self.__version += 1
+
+    def set_price(self, product_id: int, price: int) -> None:
+        """指定商品の価格を変更する。
+
+        在庫の `Drink` は新しい価格のものに差し替える（販売済みのドリンクの価格は変わらない）。
+
+        Args:
+            product_id: 対象商品のID。
+            price: 新しい価格（円、0以上。0 なら無料で販売する）。
 
         Raises:
             ProductNotFoundError: 指定IDの商品が存在しない場合。
+            ValueError: price が負の場合。
         """
         if product_id not in self.__inventory:
             raise ProductNotFoundError(product_id)
+        if price < 0:
+            raise ValueError(f"■価格は0円以上にしてください（指定: {price}円）。")
+
+        product = self.__inventory[product_id]
+        if product.stock:
+            self.__remove_from_index(product_id, product.price)
+            insort(self.__in_stock_by_price, (price, product_id))
+        product.price = price
+        product.stock = DrinkStock(Drink(product.brand, price), len(product.stock))
+        self.__version += 1
+
+    def find_affordable(self, balance: int) -> list[int]:
+        """在庫があり、価格が balance 以下の商品IDを登録順で返す。
+
+        価格順のリストを二分探索するため、該当が k 件なら O(log n + k log k)。
 
-        brand, price, drinks = self.__inventory[product_id]
-        drinks.extend(Drink(brand, price) for _ in range(quantity))
+        Args:
+            balance: 使える金額（円）。
+
+        Returns:
+            条件を満たす商品IDのリスト（get_all() と同じ並び）。
+        """
+        end = bisect_right(self.__in_stock_by_price, (balance, float("inf")))
+        product_ids = [product_id for _, product_id in self.__in_stock_by_price[:end]]
+        product_ids.sort(key=self.__position.__getitem__)
+        return product_ids
+
+    def __remove_from_index(self, product_id: int, price: int) -> None:
+        """在庫ありリストから (price, product_id) を取り除く。"""
+        i = bisect_left(self.__in_stock_by_price, (price, product_id))
+        del self.__in_stock_by_price[i]
@@ -0,0 +1,60 @@
+from drink import Drink
+
+
+class DrinkStock:
+    """1商品分の在庫を表すクラス。
+
+    在庫の1本1本は同じブランド・価格なので、`Drink` を1つだけ持ち、本数は整数で数える。
+    補充・取り出しは本数の増減のみで、何本あっても `Drink` を新たに作らない。
+
+    `len(stock)` で在庫数、`bool(stock)` で在庫の有無を返す（`deque[Drink]` と同じ使い方）。
+
+    Note:
+        取り出した `Drink` は全て同じインスタンスを共有するため、書き換えないこと。
+    """
+
+    __slots__ = ("__drink", "__count")
+
+    def __init__(self, drink: Drink, count: int = 0) -> None:
+        """在庫を初期化する。
+
+        Args:
+            drink: この商品のドリンク（全ての在庫で共有する）。
+            count: 初期の在庫数。
+        """
+        self.__drink = drink
+        self.__count = count
+
+    @property
+    def drink(self) -> Drink:
+        return self.__drink
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __repr__(self) -> str:
+        return f"DrinkStock(drink={self.__drink!r}, count={self.__count})"
+
+    def take(self, quantity: int = 1) -> Drink:
+        """在庫を quantity 本減らし、そのドリンクを返す（本数によらず O(1)）。
+
+        Raises:
+            ValueError: quantity が負の場合（在庫は変えない）。
+            IndexError: 在庫が quantity 本に満たない場合。
+        """
+        if quantity < 0:
+            raise ValueError(f"■取り出す本数は0本以上にしてください（指定: {quantity}本）。")
+        if quantity > self.__count:
+            raise IndexError("在庫がありません。")
+        self.__count -= quantity
+        return self.__drink
+
+    def add(self, quantity: int) -> None:
+        """在庫を quantity 本増やす。
+
+        Raises:
+            ValueError: quantity が負の場合（在庫は変えない）。
+        """
+        if quantity < 0:
+            raise ValueError(f"■補充本数は0本以上にしてください（指定: {quantity}本）。")
+        self.__count += quantity
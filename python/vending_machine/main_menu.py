@@ -33,6 +33,9 @@ class MainMenu:
         self.__vm = vm
         self.__suica = suica
         self.__purchased_drinks: list[tuple[int, Drink]] = []
+        # _show_all_drinks() の表示内容と、そのときの在庫の版
+        self.__all_drinks_version: int | None = None
+        self.__all_drinks_text = ""
 
     def display(self) -> None:
         """メインメニューを表示し、ループで入力を受け付ける。
@@ -125,13 +128,19 @@ class MainMenu:
         """自販機で取り扱っている全ドリンクを一覧表示する。
 
         在庫数が0本の商品や、Suica残高では購入できない商品も含めて表示する。
+        在庫の版が前回の表示から変わっていなければ、前回組み立てた文字列を再利用する。
         """
-        inventory = self.__vm.get_brands()
-        print("■商品一覧")
-
-        for product_id, drink_info in inventory.items():
-            brand, price, stock = drink_info
-            print(f"[{product_id}] {brand}：{price}円 / 在庫数：{len(stock)}本")
+        version = self.__vm.inventory_version
+        if version != self.__all_drinks_version:
+            lines = ["■商品一覧"]
+            for product_id, product in self.__vm.get_brands().items():
+                lines.append(
+                    f"[{product_id}] {product.brand}：{product.price}円 / 在庫数：{len(product.stock)}本"
+                )
+            self.__all_drinks_text = "\n".join(lines)
+            self.__all_drinks_version = version
+
+        print(self.__all_drinks_text)
 
     def _show_purchasable_drinks(self) -> None:
         """現在のSuica残高で購入可能なドリンクのみを一覧表示する。
@@ -145,9 +154,10 @@ class MainMenu:
         else:
             print("■購入可能商品一覧")
 
-            for product_id, drink_info in available_brands.items():
-                brand, price, stock = drink_info
-                print(f"[{product_id}] {brand}：{price}円 / 在庫数：{len(stock)}本")
+            for product_id, product in available_brands.items():
+                print(
+                    f"[{product_id}] {product.brand}：{product.price}円 / 在庫数：{len(product.stock)}本"
+                )
 
     def _purchase_drink(self) -> bool | None:
         """ドリンク購入処理を実行する。
@@ -215,7 +225,7 @@ class MainMenu:
             return
         else:
             inventory = self.__vm.get_brands()
-            brand = inventory[product_id][0]
+            brand = inventory[product_id].brand
             print()
             print(f"■{brand}を{quantity}本補充しました。")
 
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+from drink_stock import DrinkStock
+
+
+@dataclass(slots=True)
+class Product:
+    """自販機で取り扱う1商品（ブランド名・価格・在庫）を表すレコード。
+
+    `__slots__` を使うため、インスタンスごとの `__dict__` を持たない。
+
+    Attributes:
+        brand: ブランド名。
+        price: 価格（円）。
+        stock: 在庫（`len(stock)` で在庫数）。
+    """
+
+    brand: str
+    price: int
+    stock: DrinkStock
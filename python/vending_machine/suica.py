@@ -60,6 +60,19 @@ class Suica:
         """金額を支払う（残高から減算）。"""
         self._update_balance(-amount)
 
+    def refund(self, amount: int) -> None:
+        """支払った金額を払い戻す（残高に加算）。
+
+        決済の取り消し用。払い戻しは支払い前の残高に戻すだけなので、
+        チャージと違って最小チャージ額の制限は受けない。
+
+        Raises:
+            ValueError: amount が負の場合。
+        """
+        if amount < 0:
+            raise ValueError(f"不正な払い戻し額です（{amount}円）。")
+        self.__balance += amount
+
     def _update_balance(self, amount: int) -> None:
         """内部用：残高を増減させる（符号で加減算を切り替え）。
 
@@ -1,14 +1,15 @@
 """自販機シミュレーターの初期ドリンクデータを生成するモジュール"""
 
-from collections import deque
 from drink import Drink
+from drink_stock import DrinkStock
+from product import Product
 
 
-def create_default_inventory() -> dict[int, list]:
+def create_default_inventory() -> dict[int, Product]:
     """初期ドリンク3種類を生成して返す。
 
     Returns:
-        商品IDをキー、[ブランド名, 価格, ドリンク在庫(deque)] を値とする辞書。
+        商品IDをキー、Product（ブランド名・価格・在庫）を値とする辞書。
     """
     seeds = [
         (1, "ペプシ", 150, 5),
@@ -16,8 +17,8 @@ def create_default_inventory() -> dict[int, list]:
         (3, "いろはす", 120, 5),
     ]
 
-    # product_idごとに [brand, price, drinks] を格納する
+    # product_idごとに Product を格納する（Drink は商品ごとに1つ）
     return {
-        product_id: [brand, price, deque(Drink(brand, price) for _ in range(quantity))]
+        product_id: Product(brand, price, DrinkStock(Drink(brand, price), quantity))
         for product_id, brand, price, quantity in seeds
     }
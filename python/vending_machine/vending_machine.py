@@ -1,5 +1,9 @@
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+
 from drink_repository import DrinkRepository, SoldOutError
 from drink import Drink
+from product import Product
 from suica import Suica
 
 
@@ -19,6 +23,14 @@ class VendingMachine:
         """
         self.__repo = repo
         self.__total_amount = initial_amount
+        # get_available_brands() の結果と、そのときの (在庫の版, Suica 残高)
+        self.__available_key: tuple[int, int] | None = None
+        self.__available: Mapping[int, Product] = MappingProxyType({})
+
+    @property
+    def inventory_version(self) -> int:
+        """在庫の版（DrinkRepository.version）。販売・補充・価格変更のたびに増える。"""
+        return self.__repo.version
 
     @property
     def total_amount(self) -> int:
@@ -28,40 +40,47 @@ class VendingMachine:
     def total_amount(self, amount: int) -> None:
         self.__total_amount = amount
 
-    def get_brands(self) -> dict[int, list]:
+    def get_brands(self) -> Mapping[int, Product]:
         """全ドリンク一覧（在庫情報つき）を返す。
 
         Returns:
-            product_id をキー、(brand, price, stock_deque) を値とする辞書。
+            product_id をキー、Product を値とする読み取り専用の辞書。
         """
         return self.__repo.get_all()
 
-    def get_available_brands(self, suica: Suica) -> dict[int, list]:
+    def get_available_brands(self, suica: Suica) -> Mapping[int, Product]:
         """購入可能なドリンク一覧を返す。
 
         「Suica 残高で購入可能」かつ「在庫が 1 本以上」の商品だけを抽出する。
+        抽出はリポジトリの価格順の索引（find_affordable）で行い、全商品は走査しない。
+        在庫の版と残高が前回の呼び出しと同じなら、前回の結果をそのまま返す。
 
         Args:
             suica: 残高判定に用いる Suica。
 
         Returns:
-            条件を満たす product_id -> (brand, price, stock_deque) の辞書。
+            条件を満たす product_id -> Product の読み取り専用の辞書。
         """
-        inventory: dict[int, list] = self.get_brands()
-        available_brands: dict[int, list] = {}
+        key = (self.__repo.version, suica.balance)
+        if key == self.__available_key:
+            return self.__available
 
-        for product_id, drink_info in inventory.items():
-            _, price, stock = drink_info
-            if stock and suica.balance >= price:
-                available_brands[product_id] = drink_info
+        inventory = self.get_brands()
+        available_brands: dict[int, Product] = {
+            product_id: inventory[product_id]
+            for product_id in self.__repo.find_affordable(suica.balance)
+        }
 
-        return available_brands
+        self.__available_key = key
+        self.__available = MappingProxyType(available_brands)
+        return self.__available
 
     def vend(self, product_id: int, suica: Suica) -> tuple[int, Drink]:
         """指定商品を 1 本販売する。
 
         Suica から価格分を決済し、在庫を 1 本減らしてドリンクを払い出す。
-        在庫切れの場合は決済をロールバック（返金）して SoldOutError を伝播する。
+        価格が 0 円の商品は決済しない（vend_many と同じ）。
+        在庫切れの場合は決済をロールバック（払い戻し）して SoldOutError を伝播する。
 
         Args:
             product_id: 購入する商品の ID。
@@ -77,18 +96,71 @@ class VendingMachine:
         price = self.__repo.get_price(product_id)
 
         # 残高不足時は suica.pay が InsufficientBalanceError を送出（自動伝播）
-        suica.pay(price)
+        # 0 円の pay はチャージ扱いになり InvalidChargeAmountError になるため呼ばない
+        if price:
+            suica.pay(price)
 
         try:
             drink = self.__repo.decrease_stock(product_id)
         except SoldOutError as e:
-            # 在庫なしなら決済をロールバック（内部的にはチャージと同義）
-            suica.charge(price)
+            # 在庫なしなら決済をロールバック（最小チャージ額の制限を受けない払い戻し）
+            suica.refund(price)
             raise e
 
         self.total_amount += price
         return (product_id, drink)
 
+    def vend_many(
+        self, order: Iterable[tuple[int, int]], suica: Suica
+    ) -> list[tuple[int, Drink, int]]:
+        """複数の商品をまとめて販売する。
+
+        同じ商品IDの行は本数を合算し、合計金額を1回で決済してから、
+        全商品の在庫を1回でまとめて減らす。在庫が足りない商品があれば
+        決済をロールバック（払い戻し）し、どの商品の在庫も減らさない。
+        処理量は商品の種類数に比例し、本数にはよらない。
+
+        Args:
+            order: (product_id, 本数) の並び。本数は 1 以上。
+            suica: 決済に使用する Suica。
+
+        Returns:
+            (product_id, drink, 本数) のリスト（注文で最初に現れた順）。
+            注文が空なら空のリスト。
+
+        Raises:
+            ValueError: 本数が 1 未満の行がある場合。
+            ProductNotFoundError: 存在しない商品IDが含まれる場合。
+            InsufficientBalanceError: 残高不足（`suica.pay` が送出）。
+            SoldOutError: 在庫が足りない商品がある場合。
+        """
+        quantities: dict[int, int] = {}
+        for product_id, quantity in order:
+            if quantity < 1:
+                raise ValueError(f"■購入本数は1本以上にしてください（商品ID：{product_id}）。")
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+        total = sum(
+            self.__repo.get_price(product_id) * quantity
+            for product_id, quantity in quantities.items()
+        )
+
+        # 残高不足時は suica.pay が InsufficientBalanceError を送出（自動伝播）
+        if total:
+            suica.pay(total)
+
+        try:
+            drinks = self.__repo.decrease_stock_many(quantities)
+        except SoldOutError as e:
+            suica.refund(total)
+            raise e
+
+        self.total_amount += total
+        return [
+            (product_id, drinks[product_id], quantity)
+            for product_id, quantity in quantities.items()
+        ]
+
     def restock(self, product_id: int, quantity: int) -> None:
         """指定商品の在庫を追加する。
 
@@ -98,5 +170,19 @@ class VendingMachine:
 
         Raises:
             ProductNotFoundError: product_id が存在しない場合（リポジトリ実装に依存）。
+            ValueError: quantity が負の場合（在庫は変えない）。
         """
         self.__repo.increase_stock(product_id, quantity)
+
+    def set_price(self, product_id: int, price: int) -> None:
+        """指定商品の価格を変更する。
+
+        Args:
+            product_id: 価格を変更する商品の ID。
+            price: 新しい価格（円）。
+
+        Raises:
+            ProductNotFoundError: product_id が存在しない場合。
+            ValueError: price が負の場合。
+        """
+        self.__repo.set_price(product_id, price)